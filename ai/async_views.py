@@ -0,0 +1,164 @@
+# ASGI 모드(settings.ASYNC_VIEWS)에서 사용하는 ai 비동기 view
+# 모델 응답을 기다리는 동안 이벤트 루프가 다른 요청을 처리할 수 있도록 providers의 비동기 호출을 사용한다
+import json
+
+from asgiref.sync import sync_to_async
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework import exceptions
+
+from authorize.async_authentication import authenticated
+from common.async_http import json_response
+
+from . import providers, response_cache
+from .batch import BATCH_ERROR, arun_batch, parse_prompts
+from .payloads import GEMINI_MODEL, GPT_MODEL
+from .streaming import asse_stream, is_stream_requested, sse_response
+from .throttling import BatchRateThrottle
+
+
+async def generate(provider, prompt, image_file=None, model_name=None):
+    """views.generate의 비동기 버전 (실패하면 예외)"""
+    cache_key = response_cache.make_key(provider, model_name, prompt, image_file)
+    result = await response_cache.aget(cache_key)
+    if result is not None:
+        return result
+
+    result = await providers.acomplete(
+        provider, prompt, image_file=image_file, model_name=model_name
+    )
+    await response_cache.aput(cache_key, result, provider, model_name)
+    return result
+
+
+async def generate_response(provider, prompt, image_file=None, model_name=None):
+    """views.generate_response의 비동기 버전 (실패하면 None)"""
+    try:
+        return await generate(
+            provider, prompt, image_file=image_file, model_name=model_name
+        )
+    except Exception as e:
+        print(f"{provider} API 응답 생성 중 오류 발생: {e}")
+        return None
+
+
+async def stream_response(provider, prompt, image_file=None, model_name=None):
+    """views.stream_response의 비동기 버전 (async iterator를 반환)"""
+    cache_key = response_cache.make_key(provider, model_name, prompt, image_file)
+    cached = await response_cache.aget(cache_key)
+    if cached is not None:
+        return _single_chunk(cached)
+
+    chunks = await providers.astream(
+        provider, prompt, image_file=image_file, model_name=model_name
+    )
+    return response_cache.acached_chunks(cache_key, chunks, provider, model_name)
+
+
+async def _single_chunk(text):
+    yield text
+
+
+# 일단 모든 사용자가 사용할 수 있도록 인증 없이 허용, 추후 제거 예정
+@csrf_exempt
+@require_POST
+async def gpt_generate(request):
+    try:
+        text = request.POST.get("text")
+        image_file = request.FILES.get("image")  # 이미지 파일 객체
+
+        if is_stream_requested(request):
+            return sse_response(
+                asse_stream(
+                    "openai",
+                    await stream_response(
+                        "openai", text, image_file=image_file, model_name=GPT_MODEL
+                    ),
+                )
+            )
+
+        result = await generate_response(
+            "openai", text, image_file=image_file, model_name=GPT_MODEL
+        )
+        return json_response({"response": result})
+    except Exception as e:
+        return json_response(
+            {"error": f"GPT 요청 처리 중 오류가 발생했습니다: {str(e)}"}, status=500
+        )
+
+
+def _throttle_wait(request):
+    # 요청 한도를 넘었으면 다시 요청할 수 있을 때까지의 초, 아니면 None
+    # throttle 인스턴스는 요청마다 상태를 가지므로 매번 만들고, 캐시 접근은 스레드에서 실행한다
+    throttle = BatchRateThrottle()
+    if throttle.allow_request(request, None):
+        return None
+    return throttle.wait()
+
+
+_athrottle_wait = sync_to_async(_throttle_wait, thread_sensitive=False)
+
+
+@csrf_exempt
+@require_POST
+@authenticated
+async def gpt_batch(request):
+    wait = await _athrottle_wait(request)
+    if wait is not None:
+        # DRF의 Throttled 응답과 같은 detail, Retry-After
+        throttled = exceptions.Throttled(wait)
+        return json_response(
+            {"detail": str(throttled.detail)},
+            status=429,
+            headers={"Retry-After": str(throttled.wait)} if throttled.wait else None,
+        )
+
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError as e:
+        print(f"GPT batch 요청 본문 파싱 실패: {e}")
+        return json_response(
+            {"error": "요청 본문이 올바른 JSON이 아닙니다."}, status=400
+        )
+
+    try:
+        prompts = parse_prompts(data)
+    except ValueError as e:
+        return json_response({"error": str(e)}, status=400)
+
+    try:
+        results = await arun_batch(
+            lambda prompt: generate("openai", prompt, model_name=GPT_MODEL), prompts
+        )
+        return json_response({"results": results})
+    except Exception as e:
+        print(f"GPT batch 요청 처리 중 오류 발생: {e!r}")
+        return json_response({"error": BATCH_ERROR}, status=500)
+
+
+@csrf_exempt
+@require_POST
+async def gemini_generate(request):
+    try:
+        text = request.POST.get("text")
+        image_file = request.FILES.get("image")  # 이미지 파일 객체
+
+        if is_stream_requested(request):
+            return sse_response(
+                asse_stream(
+                    "google",
+                    await stream_response(
+                        "google", text, image_file=image_file, model_name=GEMINI_MODEL
+                    ),
+                )
+            )
+
+        result = await generate_response(
+            "google", text, image_file=image_file, model_name=GEMINI_MODEL
+        )
+        return json_response({"response": result})
+    except Exception as e:
+        return json_response(
+            {"error": f"Gemini 요청 처리 중 오류가 발생했습니다: {str(e)}"},
+            status=500,
+        )
@@ -0,0 +1,63 @@
+# 여러 프롬프트를 한 번의 요청으로 생성하는 batch 처리
+# 프롬프트는 AI_BATCH["MAX_CONCURRENCY"]개까지 동시에 생성하고, 결과는 요청 순서대로 반환한다
+# 항목별로 {"response": ...} 또는 {"error": ...}를 담아 일부가 실패해도 나머지 결과는 반환한다
+# 실패한 항목의 예외 내용은 응답에 담지 않고 로그로만 남긴다
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+ITEM_ERROR = "응답 생성 중 오류가 발생했습니다."
+BATCH_ERROR = "GPT 요청 처리 중 오류가 발생했습니다."
+
+
+def _config():
+    return getattr(settings, "AI_BATCH", {})
+
+
+def parse_prompts(data):
+    # {"prompts": ["...", ...]} 형식을 검사하고 프롬프트 목록을 반환한다 (잘못된 경우 ValueError)
+    prompts = data.get("prompts") if isinstance(data, dict) else None
+    if not isinstance(prompts, list) or not prompts:
+        raise ValueError("prompts는 비어 있지 않은 문자열 목록이어야 합니다.")
+    if not all(isinstance(prompt, str) and prompt for prompt in prompts):
+        raise ValueError("prompts의 각 항목은 비어 있지 않은 문자열이어야 합니다.")
+    max_prompts = _config().get("MAX_PROMPTS", 20)
+    if len(prompts) > max_prompts:
+        raise ValueError(f"prompts는 최대 {max_prompts}개까지 요청할 수 있습니다.")
+    return prompts
+
+
+def _error(index, e):
+    print(f"AI batch 항목 {index} 생성 중 오류 발생: {e!r}")
+    return {"error": ITEM_ERROR}
+
+
+def _result(generate, index, prompt):
+    try:
+        return {"response": generate(prompt)}
+    except Exception as e:
+        return _error(index, e)
+
+
+def run_batch(generate, prompts):
+    # generate: (prompt) -> 응답 텍스트, 실패하면 예외
+    workers = min(_config().get("MAX_CONCURRENCY", 4), len(prompts))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ai-batch") as pool:
+        return list(pool.map(lambda item: _result(generate, *item), enumerate(prompts)))
+
+
+async def arun_batch(generate, prompts):
+    # run_batch의 비동기 버전, generate: async (prompt) -> 응답 텍스트
+    semaphore = asyncio.Semaphore(_config().get("MAX_CONCURRENCY", 4))
+
+    async def result(index, prompt):
+        async with semaphore:
+            try:
+                return {"response": await generate(prompt)}
+            except Exception as e:
+                return _error(index, e)
+
+    return await asyncio.gather(
+        *(result(index, prompt) for index, prompt in enumerate(prompts))
+    )
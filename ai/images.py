@@ -0,0 +1,67 @@
+# 비전 모델에 보내기 전 업로드 이미지 전처리
+# 모델이 실제로 사용하는 해상도(AI_IMAGE["MAX_EDGE"])로 줄이고 JPEG로 다시 인코딩해 요청 크기를 줄인다
+import cv2
+import numpy as np
+from django.conf import settings
+
+from common.imaging import downscale, encode
+
+
+def _mime_type(raw):
+    # 비전 모델이 그대로 받을 수 있는 형식이면 MIME 타입, 아니면 None
+    if raw.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    if raw.startswith(b"\x89PNG"):
+        return "image/png"
+    if raw[:4] == b"RIFF" and raw[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def _decode(raw, mime_type):
+    # JPEG 등은 IMREAD_COLOR로 읽어 EXIF 회전을 적용하고,
+    # PNG/WebP는 알파 채널까지 읽어 흰 배경 위에 합성한다
+    if mime_type not in ("image/png", "image/webp"):
+        return cv2.imdecode(np.frombuffer(raw, np.uint8), cv2.IMREAD_COLOR)
+
+    image = cv2.imdecode(np.frombuffer(raw, np.uint8), cv2.IMREAD_UNCHANGED)
+    if image is None:
+        return None
+    if image.dtype != np.uint8:
+        image = (image >> 8).astype(np.uint8)
+    if image.ndim == 2:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    if image.shape[2] == 4:
+        alpha = image[:, :, 3:4].astype(np.uint16)
+        blended = image[:, :, :3].astype(np.uint16) * alpha + 255 * (255 - alpha)
+        return ((blended + 127) // 255).astype(np.uint8)
+    return image
+
+
+def prepare_image(image_file):
+    """
+    업로드 이미지를 비전 모델 입력용으로 변환한다
+    (image_bytes, mime_type)을 반환하며, cv2로 읽을 수 없는 형식이면 원본을 그대로 반환한다
+    """
+    config = settings.AI_IMAGE
+    raw = image_file.read()
+    image_file.seek(0)
+
+    original_type = _mime_type(raw)
+    image = _decode(raw, original_type)
+    if image is None:
+        return raw, getattr(image_file, "content_type", None) or "image/jpeg"
+
+    resized = downscale(image, config["MAX_EDGE"])
+    data, _, mime_type = encode(resized, "jpeg", config["QUALITY"])
+
+    # 줄일 필요가 없는 작은 이미지는 다시 인코딩한 결과가 더 클 수 있으므로 원본을 사용한다
+    if resized is image and original_type and len(data) >= len(raw):
+        data, mime_type = raw, original_type
+
+    if config.get("LOG"):
+        print(
+            f"AI 이미지 전처리: {len(raw)} -> {len(data)} bytes "
+            f"({len(raw) - len(data)} bytes 절약, {resized.shape[1]}x{resized.shape[0]})"
+        )
+    return data, mime_type
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.4 on 2026-10-17 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="CachedResponse",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("provider", models.CharField(max_length=32)),
+                ("model_name", models.CharField(max_length=64)),
+                ("response", models.TextField()),
+                ("created_at", models.DateTimeField(db_index=True)),
+                ("accessed_at", models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import models
+
+
+# AI 응답 캐시의 sqlite 백엔드 저장소 (ai/response_cache.py)
+# 같은 DB 파일을 쓰는 모든 worker 프로세스가 캐시를 공유한다
+class CachedResponse(models.Model):
+    key = models.CharField(max_length=64, primary_key=True)
+    provider = models.CharField(max_length=32)
+    model_name = models.CharField(max_length=64)
+    response = models.TextField()
+    created_at = models.DateTimeField(db_index=True)
+    accessed_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.provider}/{self.model_name} {self.key}"
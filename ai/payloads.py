@@ -0,0 +1,48 @@
+# 모델 provider별 요청 본문을 만드는 함수
+# 동기 views와 비동기 async_views가 같은 요청을 보내도록 함께 사용한다
+import base64
+
+from .images import prepare_image
+
+# gpt_generate, gemini_generate에서 사용하는 모델
+GPT_MODEL = "gpt-4o-mini"
+GEMINI_MODEL = "gemini-2.0-flash-exp"
+
+
+def openai_request(prompt, image_file=None, model_name=None):
+    # chat.completions.create(**openai_request(...))
+    if image_file:
+        image_bytes, mime_type = prepare_image(image_file)
+        base64_image = base64.b64encode(image_bytes).decode("utf-8")
+        return {
+            "model": model_name,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": prompt},
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:{mime_type};base64,{base64_image}",
+                            },
+                        },
+                    ],
+                }
+            ],
+            "max_tokens": 1000,
+        }
+    return {
+        "model": model_name,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.7,
+        "max_tokens": 1000,
+    }
+
+
+def gemini_contents(prompt, image_file=None):
+    # GenerativeModel.generate_content(gemini_contents(...))
+    if image_file:
+        image_bytes, mime_type = prepare_image(image_file)
+        return [{"mime_type": mime_type, "data": image_bytes}, prompt]
+    return prompt
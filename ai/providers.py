@@ -0,0 +1,255 @@
+# 모델 provider(OpenAI, Google) 호출 계층
+# - OpenAI 클라이언트는 프로세스당 하나씩(동기/비동기) 만들어 커넥션 풀을 재사용한다
+# - Gemini GenerativeModel은 모델 이름별로 캐시한다
+# - timeout, 재시도 횟수/backoff는 AI_PROVIDERS 설정을 따른다
+# - provider별 호출 시간을 히스토그램으로 기록한다 (latency_stats)
+import asyncio
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+import google.generativeai as genai
+import httpx
+from django.conf import settings
+from google.api_core import retry
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+from .payloads import gemini_contents, openai_request
+
+OPENAI = "openai"
+GOOGLE = "google"
+
+# 호출 시간 히스토그램 구간 상한 (초), 마지막 구간은 그 이상 전부
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 30, 60)
+
+_config = getattr(settings, "AI_PROVIDERS", {})
+_lock = threading.Lock()
+_latencies = {}
+
+genai.configure(api_key=settings.GOOGLE_API_KEY)
+
+
+def _timeout():
+    return httpx.Timeout(
+        _config.get("TIMEOUT", 60), connect=_config.get("CONNECT_TIMEOUT", 5)
+    )
+
+
+def _limits():
+    return httpx.Limits(
+        max_connections=_config.get("MAX_CONNECTIONS", 20),
+        max_keepalive_connections=_config.get("MAX_KEEPALIVE_CONNECTIONS", 10),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def openai_client():
+    # 재시도는 OpenAI SDK의 지수 backoff(0.5초부터 최대 8초, jitter)를 MAX_RETRIES번까지 사용한다
+    return OpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        timeout=_timeout(),
+        max_retries=_config.get("MAX_RETRIES", 2),
+        http_client=DefaultHttpxClient(limits=_limits()),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def async_openai_client():
+    # ASGI worker의 이벤트 루프에서만 사용한다
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        timeout=_timeout(),
+        max_retries=_config.get("MAX_RETRIES", 2),
+        http_client=DefaultAsyncHttpxClient(limits=_limits()),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def gemini_model(model_name):
+    return genai.GenerativeModel(model_name=model_name)
+
+
+def _gemini_retry(retry_class):
+    # 일시적인 오류(429, 500, 503 등)만 BACKOFF초부터 2배씩 늘리며 재시도한다
+    # 전체 재시도 시간은 (MAX_RETRIES + 1) * TIMEOUT으로 제한한다
+    timeout = _config.get("TIMEOUT", 60)
+    return retry_class(
+        predicate=retry.if_transient_error,
+        initial=_config.get("BACKOFF", 0.5),
+        maximum=_config.get("MAX_BACKOFF", 8),
+        multiplier=2,
+        timeout=timeout * (_config.get("MAX_RETRIES", 2) + 1),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def gemini_request_options():
+    return {"timeout": _config.get("TIMEOUT", 60), "retry": _gemini_retry(retry.Retry)}
+
+
+@functools.lru_cache(maxsize=1)
+def async_gemini_request_options():
+    return {
+        "timeout": _config.get("TIMEOUT", 60),
+        "retry": _gemini_retry(retry.AsyncRetry),
+    }
+
+
+def observe(provider, seconds, failed=False):
+    with _lock:
+        histogram = _latencies.setdefault(
+            provider,
+            {
+                "count": 0,
+                "errors": 0,
+                "sum": 0.0,
+                "buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+            },
+        )
+        histogram["count"] += 1
+        histogram["errors"] += int(failed)
+        histogram["sum"] += seconds
+        index = next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound),
+            len(LATENCY_BUCKETS),
+        )
+        histogram["buckets"][index] += 1
+
+
+@contextmanager
+def timed(provider):
+    # with timed("openai"): ... 블록 실행 시간을 기록한다 (예외가 나면 errors도 증가)
+    # 클라이언트가 스트리밍 도중 연결을 끊은 경우는 오류로 세지 않는다
+    started = time.perf_counter()
+    failed = True
+    try:
+        yield
+        failed = False
+    except (GeneratorExit, asyncio.CancelledError):
+        failed = False
+        raise
+    finally:
+        observe(provider, time.perf_counter() - started, failed)
+
+
+def latency_stats():
+    # {"openai": {"count", "errors", "sum", "mean", "buckets": {"0.25": n, ..., "+Inf": n}}}
+    # buckets는 구간별 개수(누적 아님)
+    labels = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+    with _lock:
+        return {
+            provider: {
+                "count": histogram["count"],
+                "errors": histogram["errors"],
+                "sum": histogram["sum"],
+                "mean": (
+                    histogram["sum"] / histogram["count"] if histogram["count"] else 0.0
+                ),
+                "buckets": dict(zip(labels, histogram["buckets"])),
+            }
+            for provider, histogram in _latencies.items()
+        }
+
+
+def complete(provider, prompt, image_file=None, model_name=None):
+    """전체 응답 텍스트를 반환 (알 수 없는 provider면 None)"""
+    if provider == OPENAI:
+        request_body = openai_request(prompt, image_file, model_name)
+        with timed(provider):
+            response = openai_client().chat.completions.create(**request_body)
+        return response.choices[0].message.content
+    elif provider == GOOGLE:
+        contents = gemini_contents(prompt, image_file)
+        with timed(provider):
+            response = gemini_model(model_name).generate_content(
+                contents, request_options=gemini_request_options()
+            )
+        return response.text
+    return None
+
+
+async def _abuild(build, prompt, image_file, *args):
+    # 업로드 이미지 전처리(cv2 디코딩, 리사이즈, 인코딩)는 이벤트 루프를 막지 않도록 스레드에서 실행한다
+    if image_file is None:
+        return build(prompt, image_file, *args)
+    return await asyncio.to_thread(build, prompt, image_file, *args)
+
+
+async def acomplete(provider, prompt, image_file=None, model_name=None):
+    """complete의 비동기 버전"""
+    if provider == OPENAI:
+        request_body = await _abuild(openai_request, prompt, image_file, model_name)
+        with timed(provider):
+            response = await async_openai_client().chat.completions.create(
+                **request_body
+            )
+        return response.choices[0].message.content
+    elif provider == GOOGLE:
+        contents = await _abuild(gemini_contents, prompt, image_file)
+        with timed(provider):
+            response = await gemini_model(model_name).generate_content_async(
+                contents, request_options=async_gemini_request_options()
+            )
+        return response.text
+    return None
+
+
+def stream(provider, prompt, image_file=None, model_name=None):
+    """응답을 생성되는 대로 텍스트 조각 단위로 내보내는 iterator"""
+    # 요청 본문(업로드 이미지 포함)은 응답 스트리밍 전에 미리 만든다
+    if provider == OPENAI:
+        return _openai_chunks(openai_request(prompt, image_file, model_name))
+    elif provider == GOOGLE:
+        return _gemini_chunks(model_name, gemini_contents(prompt, image_file))
+    raise ValueError(f"Unknown provider: {provider}")
+
+
+def _openai_chunks(request_body):
+    with timed(OPENAI):
+        with openai_client().chat.completions.create(
+            **request_body, stream=True
+        ) as response:
+            for chunk in response:
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content
+
+
+def _gemini_chunks(model_name, contents):
+    with timed(GOOGLE):
+        response = gemini_model(model_name).generate_content(
+            contents, stream=True, request_options=gemini_request_options()
+        )
+        for chunk in response:
+            yield chunk.text
+
+
+async def astream(provider, prompt, image_file=None, model_name=None):
+    """stream의 비동기 버전 (요청 본문을 만든 뒤 async iterator를 반환)"""
+    if provider == OPENAI:
+        request_body = await _abuild(openai_request, prompt, image_file, model_name)
+        return _aopenai_chunks(request_body)
+    elif provider == GOOGLE:
+        contents = await _abuild(gemini_contents, prompt, image_file)
+        return _agemini_chunks(model_name, contents)
+    raise ValueError(f"Unknown provider: {provider}")
+
+
+async def _aopenai_chunks(request_body):
+    with timed(OPENAI):
+        response = await async_openai_client().chat.completions.create(
+            **request_body, stream=True
+        )
+        async with response:
+            async for chunk in response:
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content
+
+
+async def _agemini_chunks(model_name, contents):
+    with timed(GOOGLE):
+        response = await gemini_model(model_name).generate_content_async(
+            contents, stream=True, request_options=async_gemini_request_options()
+        )
+        async for chunk in response:
+            yield chunk.text
@@ -0,0 +1,230 @@
+# gpt_generate, gemini_generate의 응답 캐시
+# (provider, 모델, 프롬프트, 이미지 SHA-256)으로 만든 키에 생성된 응답 텍스트를 보관한다
+# TTL이 지나면 만료되고, MAXSIZE를 넘으면 가장 오래 사용하지 않은 항목부터 제거한다 (LRU)
+# 백엔드는 AI_RESPONSE_CACHE["BACKEND"]로 선택한다
+#   shared: CACHES 백엔드(common/shared_cache.py), worker와 machine 간 공유 (크기 제한은 CACHES 설정을 따른다)
+#   memory: 프로세스 단위 캐시
+#   sqlite: Django DB(SQLite)의 CachedResponse 테이블, worker 프로세스 간 공유
+import hashlib
+import json
+import threading
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from cachetools import TTLCache
+from django.conf import settings
+from django.utils import timezone
+
+from common.shared_cache import Namespace
+
+from .models import CachedResponse
+
+_config = getattr(settings, "AI_RESPONSE_CACHE", {})
+_lock = threading.Lock()
+_counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _count(counter, amount=1):
+    with _lock:
+        _counters[counter] += amount
+
+
+class _CountingTTLCache(TTLCache):
+    # MAXSIZE 초과로 LRU 항목이 제거될 때 evictions를 센다
+    def popitem(self):
+        item = super().popitem()
+        _count("evictions")
+        return item
+
+
+class MemoryBackend:
+    thread_sensitive = False
+
+    def __init__(self, maxsize, ttl):
+        self._cache = _CountingTTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._cache.get(key)
+
+    def put(self, key, response, provider, model_name):
+        with self._lock:
+            self._cache[key] = response
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def size(self):
+        with self._lock:
+            return len(self._cache)
+
+
+class SqliteBackend:
+    # Django DB 연결은 스레드마다 따로 열리므로 비동기 view에서도 한 스레드에서 순서대로 접근한다
+    thread_sensitive = True
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = timedelta(seconds=ttl)
+
+    def get(self, key):
+        now = timezone.now()
+        entries = CachedResponse.objects.filter(key=key, created_at__gte=now - self.ttl)
+        response = entries.values_list("response", flat=True).first()
+        if response is not None:
+            entries.update(accessed_at=now)
+        return response
+
+    def put(self, key, response, provider, model_name):
+        now = timezone.now()
+        CachedResponse.objects.update_or_create(
+            key=key,
+            defaults={
+                "provider": provider,
+                "model_name": model_name,
+                "response": response,
+                "created_at": now,
+                "accessed_at": now,
+            },
+        )
+        self._evict(now)
+
+    def _evict(self, now):
+        CachedResponse.objects.filter(created_at__lt=now - self.ttl).delete()
+        overflow = list(
+            CachedResponse.objects.order_by("-accessed_at").values_list(
+                "key", flat=True
+            )[self.maxsize :]
+        )
+        if overflow:
+            CachedResponse.objects.filter(key__in=overflow).delete()
+        _count("evictions", len(overflow))
+
+    def clear(self):
+        CachedResponse.objects.all().delete()
+
+    def size(self):
+        return CachedResponse.objects.count()
+
+
+class SharedBackend:
+    thread_sensitive = False
+
+    def __init__(self, maxsize, ttl):
+        self._namespace = Namespace("ai", timeout=ttl)
+
+    def get(self, key):
+        return self._namespace.get(key)
+
+    def put(self, key, response, provider, model_name):
+        self._namespace.set(key, response)
+
+    def clear(self):
+        self._namespace.invalidate()
+
+    def size(self):
+        # 공유 백엔드의 항목 수는 알 수 없다 (common.shared_cache.stats() 참고)
+        return None
+
+
+BACKENDS = {
+    "shared": SharedBackend,
+    "memory": MemoryBackend,
+    "sqlite": SqliteBackend,
+}
+
+
+def _create_backend():
+    name = _config.get("BACKEND", "memory")
+    if not name:
+        return None
+    return BACKENDS[name](
+        maxsize=_config.get("MAXSIZE", 512), ttl=_config.get("TTL", 3600)
+    )
+
+
+_backend = _create_backend()
+
+
+def is_enabled():
+    return _backend is not None
+
+
+def make_key(provider, model_name, prompt, image_file=None):
+    image_hash = None
+    if image_file:
+        digest = hashlib.sha256()
+        for chunk in image_file.chunks():
+            digest.update(chunk)
+        image_file.seek(0)
+        image_hash = digest.hexdigest()
+
+    raw = json.dumps(
+        [provider, model_name, prompt, image_hash], ensure_ascii=False
+    ).encode()
+    return hashlib.sha256(raw).hexdigest()
+
+
+def get(key):
+    if _backend is None:
+        return None
+
+    response = _backend.get(key)
+    _count("misses" if response is None else "hits")
+    return response
+
+
+def put(key, response, provider="", model_name=""):
+    # 응답 생성에 실패한 경우(None, 빈 문자열)는 저장하지 않는다
+    if _backend is None or not response:
+        return
+    _backend.put(key, response, provider, model_name)
+
+
+def cached_chunks(key, chunks, provider="", model_name=""):
+    # 스트리밍 응답 조각을 그대로 내보내고, 끝까지 받은 경우에만 전체 응답을 저장한다
+    parts = []
+    for text in chunks:
+        if text:
+            parts.append(text)
+        yield text
+    put(key, "".join(parts), provider, model_name)
+
+
+# 비동기 view용 (캐시 접근을 이벤트 루프 밖의 스레드에서 실행한다)
+# shared, memory 백엔드는 스레드 안전하므로 요청마다 다른 스레드에서 동시에 실행하고,
+# sqlite 백엔드만 thread_sensitive로 한 스레드에서 순서대로 실행한다
+_thread_sensitive = getattr(_backend, "thread_sensitive", False)
+aget = sync_to_async(get, thread_sensitive=_thread_sensitive)
+aput = sync_to_async(put, thread_sensitive=_thread_sensitive)
+
+
+async def acached_chunks(key, chunks, provider="", model_name=""):
+    # cached_chunks의 비동기 버전
+    parts = []
+    async for text in chunks:
+        if text:
+            parts.append(text)
+        yield text
+    await aput(key, "".join(parts), provider, model_name)
+
+
+def clear():
+    if _backend is not None:
+        _backend.clear()
+
+
+def stats():
+    with _lock:
+        counters = dict(_counters)
+    lookups = counters["hits"] + counters["misses"]
+    return {
+        **counters,
+        "backend": _config.get("BACKEND", "memory") or None,
+        "size": _backend.size() if _backend is not None else 0,
+        "maxsize": _config.get("MAXSIZE", 512),
+        "ttl": _config.get("TTL", 3600),
+        "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+    }
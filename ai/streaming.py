@@ -0,0 +1,56 @@
+# 모델 응답을 토큰 단위로 전달하는 Server-Sent Events 헬퍼
+# 각 조각은 `data: {"delta": "..."}`, 끝나면 `event: done`, 오류가 나면 `event: error`로 전송한다
+# 오류 내용은 서버 로그에만 남기고 클라이언트에는 STREAM_ERROR만 보낸다
+# 클라이언트가 연결을 끊으면 제너레이터가 닫히면서 모델 스트림도 함께 닫힌다
+import json
+
+from django.http import StreamingHttpResponse
+
+STREAM_ERROR = "응답 생성 중 오류가 발생했습니다."
+
+
+def is_stream_requested(request):
+    # form 필드 또는 쿼리 파라미터 stream=true|1
+    value = request.POST.get("stream") or request.GET.get("stream") or ""
+    return value.lower() in ("true", "1")
+
+
+def sse_event(data, event=None):
+    message = f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+    if event:
+        message = f"event: {event}\n{message}"
+    return message
+
+
+def sse_stream(provider, chunks):
+    # chunks: 텍스트 조각을 내보내는 동기 iterable
+    try:
+        for text in chunks:
+            if text:
+                yield sse_event({"delta": text})
+    except Exception as e:
+        print(f"{provider} API 스트리밍 중 오류 발생: {e}")
+        yield sse_event({"error": STREAM_ERROR}, event="error")
+        return
+    yield sse_event({}, event="done")
+
+
+async def asse_stream(provider, chunks):
+    # chunks: 텍스트 조각을 내보내는 async iterable
+    try:
+        async for text in chunks:
+            if text:
+                yield sse_event({"delta": text})
+    except Exception as e:
+        print(f"{provider} API 스트리밍 중 오류 발생: {e}")
+        yield sse_event({"error": STREAM_ERROR}, event="error")
+        return
+    yield sse_event({}, event="done")
+
+
+def sse_response(stream):
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # 프록시(nginx 등)가 응답을 버퍼링하지 않도록 한다
+    response["X-Accel-Buffering"] = "no"
+    return response
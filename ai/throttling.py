@@ -0,0 +1,18 @@
+# AI 요청 rate limit
+# DRF SimpleRateThrottle을 사용하여 CACHES 백엔드에 사용자별 요청 기록을 저장하므로 모든 worker가 같은 한도를 공유한다
+from django.conf import settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class BatchRateThrottle(SimpleRateThrottle):
+    # gpt_batch 요청 수를 사용자(user_id)별로 AI_BATCH["RATE"]까지 허용한다 (예: "10/min")
+    scope = "ai_batch"
+
+    def get_rate(self):
+        return getattr(settings, "AI_BATCH", {}).get("RATE", "10/min")
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": request.user.user_id,
+        }
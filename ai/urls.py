@@ -1,8 +1,13 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import async_views, views
+
+# ASGI 모드에서는 I/O 대기 시간이 긴 view를 비동기 버전으로 처리한다
+hot_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
-    path("gpt/generate/", views.gpt_generate, name="gpt_generate"),
-    path("gemini/generate/", views.gemini_generate, name="gemini_generate"),
+    path("gpt/generate/", hot_views.gpt_generate, name="gpt_generate"),
+    path("gpt/batch/", hot_views.gpt_batch, name="gpt_batch"),
+    path("gemini/generate/", hot_views.gemini_generate, name="gemini_generate"),
 ]
@@ -1,70 +1,61 @@
-import base64
-
-import google.generativeai as genai
-from django.conf import settings
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from openai import OpenAI
 from rest_framework import status
-from rest_framework.decorators import api_view, parser_classes, permission_classes
-from rest_framework.parsers import FormParser, MultiPartParser
-from rest_framework.permissions import AllowAny
+from rest_framework.decorators import (
+    api_view,
+    parser_classes,
+    permission_classes,
+    throttle_classes,
+)
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
-# API 클라이언트 초기화
-openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
-genai.configure(api_key=settings.GOOGLE_API_KEY)
+from . import providers, response_cache
+from .batch import BATCH_ERROR, parse_prompts, run_batch
+from .payloads import GEMINI_MODEL, GPT_MODEL
+from .streaming import is_stream_requested, sse_response, sse_stream
+from .throttling import BatchRateThrottle
+
+
+def generate(provider, prompt, image_file=None, model_name=None):
+    """API를 사용하여 응답 생성 (실패하면 예외)"""
+    # 같은 provider, 모델, 프롬프트, 이미지 요청은 캐시된 응답을 반환한다
+    cache_key = response_cache.make_key(provider, model_name, prompt, image_file)
+    result = response_cache.get(cache_key)
+    if result is not None:
+        return result
+
+    result = providers.complete(
+        provider, prompt, image_file=image_file, model_name=model_name
+    )
+    response_cache.put(cache_key, result, provider, model_name)
+    return result
 
 
 def generate_response(provider, prompt, image_file=None, model_name=None):
-    """API를 사용하여 응답 생성"""
+    """API를 사용하여 응답 생성 (실패하면 None)"""
     try:
-        if provider == "openai":
-            if image_file:
-                base64_image = base64.b64encode(image_file.read()).decode("utf-8")
-                response = openai_client.chat.completions.create(
-                    model=model_name,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {"type": "text", "text": prompt},
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/jpeg;base64,{base64_image}",
-                                    },
-                                },
-                            ],
-                        }
-                    ],
-                    max_tokens=1000,
-                )
-            else:
-                response = openai_client.chat.completions.create(
-                    model=model_name,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.7,
-                    max_tokens=1000,
-                )
-            return response.choices[0].message.content
-        elif provider == "google":
-            if image_file:
-                base64_image = base64.b64encode(image_file.read()).decode("utf-8")
-                model = genai.GenerativeModel(model_name=model_name)
-                response = model.generate_content(
-                    [{"mime_type": "image/jpeg", "data": base64_image}, prompt]
-                )
-            else:
-                model = genai.GenerativeModel(model_name=model_name)
-                response = model.generate_content(prompt)
-            return response.text
-        return None
+        return generate(provider, prompt, image_file=image_file, model_name=model_name)
     except Exception as e:
         print(f"{provider} API 응답 생성 중 오류 발생: {e}")
         return None
 
 
+def stream_response(provider, prompt, image_file=None, model_name=None):
+    """API 응답을 생성되는 대로 텍스트 조각 단위로 반환하는 iterator"""
+    # 캐시된 응답이 있으면 한 조각으로 반환하고, 없으면 스트리밍이 끝난 뒤 캐시에 저장한다
+    cache_key = response_cache.make_key(provider, model_name, prompt, image_file)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return iter([cached])
+
+    chunks = providers.stream(
+        provider, prompt, image_file=image_file, model_name=model_name
+    )
+    return response_cache.cached_chunks(cache_key, chunks, provider, model_name)
+
+
 @swagger_auto_schema(
     method="post",
     operation_description="OpenAI 모델을 사용하여 텍스트 및 이미지 파일(optional)을 업로드합니다.",
@@ -84,10 +75,17 @@ def generate_response(provider, prompt, image_file=None, model_name=None):
             description="이미지 파일 (optional)",
             required=False,
         ),
+        openapi.Parameter(
+            "stream",
+            in_=openapi.IN_FORM,
+            type=openapi.TYPE_BOOLEAN,
+            description="true이면 응답을 Server-Sent Events(text/event-stream)로 토큰 단위 전송 (optional)",
+            required=False,
+        ),
     ],
     responses={
         200: openapi.Response(
-            "응답",
+            '응답 (stream=true이면 data: {"delta": ...} 이벤트 후 event: done)',
             openapi.Schema(
                 type=openapi.TYPE_OBJECT,
                 properties={
@@ -109,9 +107,19 @@ def gpt_generate(request):
     try:
         text = request.data.get("text")
         image_file = request.FILES.get("image")  # 이미지 파일 객체
-        model_name = "gpt-4o-mini"
+        model_name = GPT_MODEL
         provider = "openai"
 
+        if is_stream_requested(request):
+            return sse_response(
+                sse_stream(
+                    provider,
+                    stream_response(
+                        provider, text, image_file=image_file, model_name=model_name
+                    ),
+                )
+            )
+
         result = generate_response(
             provider, text, image_file=image_file, model_name=model_name
         )
@@ -123,6 +131,73 @@ def gpt_generate(request):
         )
 
 
+@swagger_auto_schema(
+    method="post",
+    operation_description="OpenAI 모델로 여러 프롬프트의 응답을 동시에 생성합니다. 결과는 prompts 순서대로 반환되며, 실패한 항목은 error를 포함합니다.",
+    request_body=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        required=["prompts"],
+        properties={
+            "prompts": openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Schema(type=openapi.TYPE_STRING),
+                description="텍스트 입력 목록",
+            ),
+        },
+    ),
+    responses={
+        200: openapi.Response(
+            "응답",
+            openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "results": openapi.Schema(
+                        type=openapi.TYPE_ARRAY,
+                        items=openapi.Schema(
+                            type=openapi.TYPE_OBJECT,
+                            properties={
+                                "response": openapi.Schema(
+                                    type=openapi.TYPE_STRING,
+                                    description="생성된 응답",
+                                ),
+                                "error": openapi.Schema(
+                                    type=openapi.TYPE_STRING,
+                                    description="항목 처리 중 오류 (실패한 경우)",
+                                ),
+                            },
+                        ),
+                    ),
+                },
+            ),
+        ),
+        400: openapi.Response(description="잘못된 요청"),
+        401: openapi.Response(description="인증 실패"),
+        429: openapi.Response(description="요청 한도 초과"),
+        500: openapi.Response(description="서버 오류"),
+    },
+)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+@throttle_classes([BatchRateThrottle])
+@parser_classes([JSONParser])
+def gpt_batch(request):
+    try:
+        prompts = parse_prompts(request.data)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        results = run_batch(
+            lambda prompt: generate("openai", prompt, model_name=GPT_MODEL), prompts
+        )
+        return Response({"results": results}, status=status.HTTP_200_OK)
+    except Exception as e:
+        print(f"GPT batch 요청 처리 중 오류 발생: {e!r}")
+        return Response(
+            {"error": BATCH_ERROR}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
 @swagger_auto_schema(
     method="post",
     operation_description="Google 모델을 사용하여 텍스트 및 이미지(optional)를 기반으로 응답을 생성합니다.",
@@ -142,10 +217,17 @@ def gpt_generate(request):
             description="이미지 파일 (optional)",
             required=False,
         ),
+        openapi.Parameter(
+            "stream",
+            in_=openapi.IN_FORM,
+            type=openapi.TYPE_BOOLEAN,
+            description="true이면 응답을 Server-Sent Events(text/event-stream)로 토큰 단위 전송 (optional)",
+            required=False,
+        ),
     ],
     responses={
         200: openapi.Response(
-            "응답",
+            '응답 (stream=true이면 data: {"delta": ...} 이벤트 후 event: done)',
             openapi.Schema(
                 type=openapi.TYPE_OBJECT,
                 properties={
@@ -167,9 +249,19 @@ def gemini_generate(request):
     try:
         text = request.data.get("text")
         image_file = request.FILES.get("image")  # 이미지 파일 객체
-        model_name = "gemini-2.0-flash-exp"
+        model_name = GEMINI_MODEL
         provider = "google"
 
+        if is_stream_requested(request):
+            return sse_response(
+                sse_stream(
+                    provider,
+                    stream_response(
+                        provider, text, image_file=image_file, model_name=model_name
+                    ),
+                )
+            )
+
         result = generate_response(
             provider, text, image_file=image_file, model_name=model_name
         )
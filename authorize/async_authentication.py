@@ -0,0 +1,33 @@
+# 비동기 view용 인증 데코레이터
+# CustomJWTAuthentication을 그대로 사용하되, principal cache miss 시 동기 Supabase 조회가 있으므로
+# 이벤트 루프를 막지 않도록 스레드에서 실행한다
+import functools
+
+from asgiref.sync import sync_to_async
+from rest_framework import exceptions
+
+from common.async_http import json_response
+
+from .custom_authentication import CustomJWTAuthentication
+
+_authentication = CustomJWTAuthentication()
+_authenticate = sync_to_async(_authentication.authenticate, thread_sensitive=False)
+
+
+def authenticated(view):
+    # DRF의 IsAuthenticated와 같이 인증되지 않은 요청은 401로 응답한다
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        result = await _authenticate(request)
+        if result is None:
+            return json_response(
+                {"detail": str(exceptions.NotAuthenticated.default_detail)},
+                status=401,
+                headers={
+                    "WWW-Authenticate": _authentication.authenticate_header(request)
+                },
+            )
+        request.user, request.auth = result
+        return await view(request, *args, **kwargs)
+
+    return wrapper
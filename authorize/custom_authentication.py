@@ -1,15 +1,18 @@
 # rest_framework_simplejwt.authentication의 JWTAuthentication을 상속받아 CustomJWTAuthentication 클래스를 작성
 # get_user 메서드를 오버라이드하여 사용자 정보를 Supabase에서 가져오도록 수정
-from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from rest_framework import exceptions
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from supabase import create_client
+from supabase import Client
 
+from common import projections
+from common.supabase_clients import get_client
+
+from . import principal_cache, profile_claims
 from .custom_user import CustomUser
 
-# Initialize Supabase client
-supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+# Supabase 클라이언트 (프로세스 단위로 공유)
+supabase: Client = get_client()
 
 
 class CustomJWTAuthentication(JWTAuthentication):
@@ -46,12 +49,24 @@ class CustomJWTAuthentication(JWTAuthentication):
                 code="token_invalid",
             )
 
-        # Fetch the user from Supabase
-        user_data = supabase.table("users").select("*").eq("user_id", user_id).execute()
-        if not user_data.data:
-            raise exceptions.AuthenticationFailed(
-                _("User not found"), code="user_not_found"
+        # claims-only 모드에서는 토큰의 claim만으로 사용자를 구성한다
+        user_info = profile_claims.user_info_from_claims(validated_token)
+        if user_info is not None:
+            return CustomUser(user_info)
+
+        # 캐시에 없을 때만 Supabase에서 사용자 정보를 가져온다
+        user_info = principal_cache.get(user_id)
+        if user_info is None:
+            user_data = (
+                supabase.table("users")
+                .select(projections.AUTH_USER)
+                .eq("user_id", user_id)
+                .execute()
             )
+            if not user_data.data:
+                raise exceptions.AuthenticationFailed(
+                    _("User not found"), code="user_not_found"
+                )
+            user_info = principal_cache.put(user_id, user_data.data[0])
 
-        user_info = user_data.data[0]
         return CustomUser(user_info)
@@ -0,0 +1,41 @@
+# CustomJWTAuthentication.get_user에서 사용하는 사용자 캐시
+# user_id를 키로 CustomUser 구성에 필요한 필드만 보관하여 매 요청마다 users 테이블을 조회하지 않도록 한다
+# CACHES 백엔드(common/shared_cache.py)에 저장하므로 모든 worker가 같은 캐시를 사용한다
+# 항목 수는 MAXSIZE(파일 캐시)로 제한하고 TTL이 지나면 자동으로 제거되며, users 테이블을 수정하는 뷰에서는 invalidate를 호출한다
+from django.conf import settings
+
+from common.shared_cache import Namespace
+
+PRINCIPAL_FIELDS = ("user_id", "email", "oauth_provider", "full_name")
+
+_config = getattr(settings, "PRINCIPAL_CACHE", {})
+_namespace = Namespace(
+    "principal", timeout=_config.get("TTL", 60), alias=_config.get("ALIAS")
+)
+
+
+def get(user_id):
+    return _namespace.get(user_id)
+
+
+def put(user_id, user_info):
+    principal = {field: user_info.get(field) for field in PRINCIPAL_FIELDS}
+    _namespace.set(user_id, principal)
+    return principal
+
+
+def invalidate(*user_ids):
+    for user_id in user_ids:
+        _namespace.delete(user_id)
+
+
+def clear():
+    _namespace.invalidate()
+
+
+def stats():
+    return {
+        **_namespace.stats(),
+        "ttl": _namespace.timeout,
+        "maxsize": _config.get("MAXSIZE"),
+    }
@@ -0,0 +1,51 @@
+# 액세스 토큰에 CustomUser 구성에 필요한 프로필 필드를 claim으로 담는 "claims-only" 인증 모드
+# JWT_PROFILE_CLAIMS["ENABLED"]가 켜져 있으면 로그인/회원가입/토큰 갱신 시 claim을 추가하고,
+# CustomJWTAuthentication은 네트워크 요청 없이 토큰만으로 CustomUser를 만든다
+# claim마다 버전을 함께 기록하며, 설정의 버전과 다르면 (오래된 토큰) DB 조회로 돌아간다
+from django.conf import settings
+
+VERSION_CLAIM = "pcv"
+
+
+def _config():
+    return getattr(settings, "JWT_PROFILE_CLAIMS", {})
+
+
+def is_enabled():
+    return _config().get("ENABLED", False)
+
+
+def add_profile_claims(token, user_info):
+    if not is_enabled():
+        return token
+
+    versions = _config()["VERSIONS"]
+    for claim in versions:
+        # 값이 없는 필드도 DB 조회 경로와 같도록 None(null) 그대로 담는다
+        token[claim] = user_info.get(claim)
+    token[VERSION_CLAIM] = dict(versions)
+    return token
+
+
+def has_current_claims(token):
+    if not is_enabled():
+        return False
+
+    token_versions = token.get(VERSION_CLAIM)
+    if not isinstance(token_versions, dict):
+        return False
+    return all(
+        claim in token and token_versions.get(claim) == version
+        for claim, version in _config()["VERSIONS"].items()
+    )
+
+
+def user_info_from_claims(token):
+    # 최신 claim이 모두 있는 경우에만 사용자 정보를 반환하고, 아니면 None
+    if not has_current_claims(token):
+        return None
+
+    user_info = {"user_id": token["user_id"]}
+    for claim in _config()["VERSIONS"]:
+        user_info[claim] = token[claim]
+    return user_info
@@ -13,10 +13,15 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
-from supabase import Client, create_client
+from supabase import Client
 
-# Supabase 클라이언트 설정
-supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+from common import projections
+from common.supabase_clients import get_client
+
+from .profile_claims import add_profile_claims, has_current_claims, is_enabled
+
+# Supabase 클라이언트 (프로세스 단위로 공유)
+supabase: Client = get_client()
 
 
 # 일반 로그인 - 비밀번호 검증
@@ -95,7 +100,7 @@ def google_callback(request):
         # 이미 등록된 사용자인지 검색
         existing_user = (
             supabase.table("users")
-            .select("*")
+            .select(projections.AUTH_USER)
             .eq("user_id", user_id)
             .eq("oauth_provider", "google")
             .execute()
@@ -120,13 +125,15 @@ def google_callback(request):
                 "num_parties": 0,
             }
             result = supabase.table("users").insert(user_info).execute()
-            user_id = result.data[0]["user_id"]
+            user = result.data[0]
         else:
-            user_id = existing_user.data[0]["user_id"]
+            user = existing_user.data[0]
+        user_id = user["user_id"]
 
         # JWT 토큰 생성, for_user 메서드 사용하지 않고 수동으로 정보 추가
         refresh = RefreshToken()
         refresh["user_id"] = user_id
+        add_profile_claims(refresh, user)
         refresh.set_exp(lifetime=settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"])
         access_token = refresh.access_token
         access_token.set_exp(lifetime=settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"])
@@ -178,6 +185,17 @@ def token_refresh(request):
         access_token = refresh.access_token
         access_token.set_exp(lifetime=settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"])
 
+        # 리프레시 토큰의 claim이 없거나 오래된 경우 DB에서 다시 채운다
+        if is_enabled() and not has_current_claims(access_token):
+            user_data = (
+                supabase.table("users")
+                .select(projections.AUTH_USER)
+                .eq("user_id", refresh.get("user_id"))
+                .execute()
+            )
+            if user_data.data:
+                add_profile_claims(access_token, user_data.data[0])
+
         response_data = {
             "message": "토큰이 갱신되었습니다",
             "access_token": str(access_token),
@@ -236,7 +254,12 @@ def register(request):
             )
 
         # unique 항목인 이메일 중복 검사
-        existing_user = supabase.table("users").select("*").eq("email", email).execute()
+        existing_user = (
+            supabase.table("users")
+            .select(projections.USER_EXISTS)
+            .eq("email", email)
+            .execute()
+        )
         if existing_user.data:
             return Response(
                 {"error": "이미 등록된 이메일입니다."},
@@ -247,7 +270,10 @@ def register(request):
         while True:
             user_id = str(uuid.uuid4())
             existing_user = (
-                supabase.table("users").select("*").eq("user_id", user_id).execute()
+                supabase.table("users")
+                .select(projections.USER_EXISTS)
+                .eq("user_id", user_id)
+                .execute()
             )
             if not existing_user.data:
                 break
@@ -269,6 +295,7 @@ def register(request):
             # JWT 토큰 생성, for_user 메서드 사용하지 않고 수동으로 정보 추가
             refresh = RefreshToken()
             refresh["user_id"] = user_id
+            add_profile_claims(refresh, user_info)
             refresh.set_exp(lifetime=settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"])
             access_token = refresh.access_token
             access_token.set_exp(lifetime=settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"])
@@ -324,7 +351,12 @@ def login(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        user_data = supabase.table("users").select("*").eq("email", email).execute()
+        user_data = (
+            supabase.table("users")
+            .select(projections.LOGIN_USER)
+            .eq("email", email)
+            .execute()
+        )
 
         if not user_data.data:
             return Response(
@@ -342,6 +374,7 @@ def login(request):
         # JWT 토큰 생성, for_user 메서드 사용하지 않고 수동으로 정보 추가
         refresh = RefreshToken()
         refresh["user_id"] = user["user_id"]
+        add_profile_claims(refresh, user)
         refresh.set_exp(lifetime=settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"])
         access_token = refresh.access_token
         access_token.set_exp(lifetime=settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"])
@@ -0,0 +1,13 @@
+# ASGI 모드의 비동기 view(async_views)에서 사용하는 응답 헬퍼
+# 비동기 view는 DRF를 거치지 않으므로 DRF JSONRenderer와 같은 형식(UTF-8, 공백 없음)으로 직접 직렬화한다
+from django.http import JsonResponse
+
+
+def json_response(data, status=200, headers=None):
+    return JsonResponse(
+        data,
+        status=status,
+        headers=headers,
+        safe=False,
+        json_dumps_params={"ensure_ascii": False, "separators": (",", ":")},
+    )
@@ -0,0 +1,29 @@
+# 한 요청 안에서 서로 독립적인 Supabase 조회를 동시에 실행하기 위한 헬퍼
+# 동기 supabase 클라이언트의 요청은 대부분 네트워크 대기 시간이므로 스레드 풀로 겹쳐서 실행하면
+# 응답 시간이 각 조회 시간의 합이 아니라 가장 느린 조회 시간에 가까워진다
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "FANOUT_MAX_WORKERS", 8),
+    thread_name_prefix="fanout",
+)
+
+
+def gather(*calls):
+    """
+    인자로 받은 callable들을 동시에 실행하고, 모두 끝날 때까지 기다린 뒤 결과를 순서대로 반환한다
+    하나라도 예외가 발생하면 나머지가 끝난 뒤 첫 번째 예외를 다시 발생시킨다
+
+    예) parties, events = gather(parties_query.execute, events_query.execute)
+    """
+    if len(calls) <= 1:
+        return [call() for call in calls]
+
+    futures = [_executor.submit(call) for call in calls]
+    errors = [future.exception() for future in futures]
+    for error in errors:
+        if error is not None:
+            raise error
+    return [future.result() for future in futures]
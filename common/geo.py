@@ -0,0 +1,72 @@
+# 좌표 거리 계산 (NumPy 벡터 연산)
+# parties, events 행의 coordinates와 주차 구역은 지도 이미지 위의 평면(픽셀) 좌표 [x, y]이므로
+# 이 좌표에는 planar_nearest(유클리드 거리)를 사용한다
+# - euclidean / in_square / planar_nearest: 평면 좌표의 거리, 반경을 감싸는 정사각형 사전 필터, 반경 내 top-k
+# - top_k: 거리순 상위 k개 (거리가 같으면 앞에 있는 점이 우선)
+# 행의 좌표는 coordinate_arrays로 두 배열로 바꿔 사용한다
+import numpy as np
+
+
+def coordinate_arrays(rows, key="coordinates"):
+    # rows의 평면 좌표 [x, y]를 두 배열로 변환한다
+    # 좌표가 없거나 형식이 잘못된 행은 NaN이 되어 어떤 검색에도 포함되지 않는다
+    values = np.full((len(rows), 2), np.nan, dtype=np.float64)
+    for i, row in enumerate(rows):
+        coordinates = row.get(key) or []
+        if len(coordinates) == 2:
+            values[i] = coordinates
+    return values[:, 0], values[:, 1]
+
+
+def euclidean(x, y, xs, ys):
+    # (x, y)에서 각 (xs[i], ys[i])까지의 평면 거리 배열 (좌표와 같은 단위)
+    return np.hypot(np.asarray(xs) - x, np.asarray(ys) - y)
+
+
+def in_square(xs, ys, x, y, radius):
+    # (x, y)를 중심으로 한 변이 2 * radius인 정사각형 안에 있는 점의 bool 배열
+    return (np.abs(xs - x) <= radius) & (np.abs(ys - y) <= radius)
+
+
+def planar_nearest(x, y, xs, ys, k=None, radius=None):
+    """
+    평면 좌표 (x, y)에서 가까운 순으로 (indices, distances)
+
+    k: 최대 개수 (None이면 전부)
+    radius: 지정하면 정사각형으로 후보를 거른 뒤 radius(좌표 단위) 이내만 반환한다
+    """
+    xs, ys = np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)
+    if radius is None:
+        candidates = np.arange(len(xs))
+    else:
+        candidates = np.flatnonzero(in_square(xs, ys, x, y, radius))
+
+    distances = euclidean(x, y, xs[candidates], ys[candidates])
+    keep = np.isfinite(distances) if radius is None else distances <= radius
+    candidates, distances = candidates[keep], distances[keep]
+
+    ranking = top_k(distances, len(distances) if k is None else k)
+    return candidates[ranking], distances[ranking]
+
+
+def top_k(distances, k, ties=None):
+    """
+    거리가 가장 작은 k개의 위치(index) 배열, 가까운 순
+
+    전체를 정렬하지 않고 k번째 거리 이하인 후보만 정렬한다.
+    거리가 같으면 ties(기본값은 위치) 값이 작은 쪽이 우선하고, NaN은 맨 뒤로 간다.
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+    ties = np.arange(len(distances)) if ties is None else np.asarray(ties)
+    k = min(k, len(distances))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    if k < len(distances):
+        threshold = np.partition(distances, k - 1)[k - 1]
+        # NaN과의 비교는 항상 False이므로 threshold가 NaN이면 모두 후보가 된다
+        candidates = np.flatnonzero(~(distances > threshold))
+    else:
+        candidates = np.arange(len(distances))
+    ranking = np.lexsort((ties[candidates], distances[candidates]))
+    return candidates[ranking][:k]
@@ -0,0 +1,30 @@
+# cv2 이미지 리사이즈/인코딩 헬퍼 (파티 프레임 합성, AI 이미지 전처리에서 사용)
+import cv2
+
+# 출력 코덱별 (확장자, content-type, imencode 품질 옵션)
+OUTPUT_FORMATS = {
+    "jpeg": ("jpg", "image/jpeg", cv2.IMWRITE_JPEG_QUALITY),
+    "webp": ("webp", "image/webp", cv2.IMWRITE_WEBP_QUALITY),
+    "png": ("png", "image/png", None),
+}
+
+
+def downscale(image, max_edge):
+    # 긴 변이 max_edge를 넘으면 비율을 유지하며 줄인다
+    height, width = image.shape[:2]
+    if not max_edge or max(height, width) <= max_edge:
+        return image
+
+    scale = max_edge / max(height, width)
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+def encode(image, output_format, quality):
+    # (image_bytes, file_extension, content_type)
+    extension, content_type, quality_flag = OUTPUT_FORMATS[output_format]
+    params = [quality_flag, quality] if quality_flag is not None else []
+    success, buffer = cv2.imencode(f".{extension}", image, params)
+    if not success:
+        raise ValueError(f"Failed to encode image as {output_format}")
+    return buffer.tobytes(), extension, content_type
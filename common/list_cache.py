@@ -0,0 +1,192 @@
+# parties_list, events_list 목록 응답의 read-through 캐시
+# 모든 사용자에게 같은 목록을 JSON bytes로 직렬화해 CACHES 백엔드(common/shared_cache.py)에 보관하고,
+# TTL 동안은 Supabase 조회와 직렬화 없이 그대로 응답한다
+# 목록을 바꾸는 view(생성, 참가, 종료, 완료)에서는 invalidate(namespace)로 모든 worker의 해당 목록 캐시를 비운다
+# LIST_CACHE["STALE_WHILE_REVALIDATE"]가 켜져 있으면 TTL이 지난 응답을 STALE_TTL 동안 그대로 반환하고,
+# 키마다 한 worker에서 한 번만 백그라운드(동기 view는 스레드, 비동기 view는 task)로 다시 만든다
+import asyncio
+import json
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+from .shared_cache import Namespace
+
+PARTIES = "parties"
+EVENTS = "events"
+
+_config = getattr(settings, "LIST_CACHE", {})
+_lock = threading.Lock()
+_counters = {"stale_hits": 0, "refreshes": 0, "refresh_errors": 0}
+_tasks = set()
+
+
+def _ttl():
+    return _config.get("TTL", 5)
+
+
+def _stale_ttl():
+    if not _config.get("STALE_WHILE_REVALIDATE", False):
+        return 0
+    return _config.get("STALE_TTL", 30)
+
+
+# 항목은 (body, headers, 저장 시각), stale 응답을 반환하는 기간까지 보관한다
+_namespaces = {
+    name: Namespace(f"list:{name}", timeout=max(_ttl() + _stale_ttl(), 1))
+    for name in (PARTIES, EVENTS)
+}
+
+
+def _count(counter):
+    with _lock:
+        _counters[counter] += 1
+
+
+def is_enabled():
+    return _ttl() > 0
+
+
+def serialize(data):
+    # DRF JSONRenderer와 같은 형식 (UTF-8, 공백 없음)
+    return json.dumps(
+        data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def response(body, headers=None):
+    # 동기(DRF) view와 비동기 view 모두 직렬화된 body를 그대로 응답한다
+    return HttpResponse(body, content_type="application/json", headers=headers)
+
+
+def _lookup(namespace, key):
+    # (namespace 버전, entry, stale), 없으면 entry는 None
+    # 버전은 목록을 만들기 전에 읽어 두고 저장할 때 사용한다
+    # 그 사이에 invalidate되면 이전 버전 키에 저장되어 읽히지 않는다
+    cache = _namespaces[namespace]
+    version = cache.version()
+    entry = cache.get(key, version)
+    if entry is None:
+        return version, None, False
+    stale = _stale_ttl() > 0 and time.time() - entry[2] > _ttl()
+    if stale:
+        _count("stale_hits")
+    return version, entry, stale
+
+
+def _store(namespace, key, version, data, headers):
+    body, headers = serialize(data), headers or {}
+    _namespaces[namespace].set(key, (body, headers, time.time()), version=version)
+    return body, headers
+
+
+def _begin_refresh(namespace, key):
+    # 다른 요청이나 worker가 같은 키를 갱신 중이면 False
+    started = _namespaces[namespace].add(
+        f"refresh:{key}", True, timeout=max(_stale_ttl(), 1)
+    )
+    if started:
+        _count("refreshes")
+    return started
+
+
+def _end_refresh(namespace, key, error=None):
+    _namespaces[namespace].delete(f"refresh:{key}")
+    if error is not None:
+        _count("refresh_errors")
+        print(f"List cache refresh failed for {namespace} {key!r}: {error}")
+
+
+def fetch(namespace, key, build):
+    """
+    캐시된 (body, headers)를 반환하고, 없으면 build()가 반환한 (data, headers)를 직렬화해 저장한다
+    key는 namespace 안에서의 키(str), build에서 발생한 예외는 저장하지 않고 그대로 전달한다
+    """
+    if not is_enabled():
+        data, headers = build()
+        return serialize(data), headers or {}
+
+    version, entry, stale = _lookup(namespace, key)
+    if entry is not None:
+        if stale and _begin_refresh(namespace, key):
+            threading.Thread(
+                target=_refresh, args=(namespace, key, build), daemon=True
+            ).start()
+        return entry[0], entry[1]
+
+    return _store(namespace, key, version, *build())
+
+
+def _refresh(namespace, key, build):
+    error = None
+    try:
+        version = _namespaces[namespace].version()
+        _store(namespace, key, version, *build())
+    except Exception as e:
+        error = e
+    finally:
+        _end_refresh(namespace, key, error)
+
+
+# 캐시 백엔드(파일/Redis) 접근은 이벤트 루프 밖 스레드에서 실행한다
+_alookup = sync_to_async(_lookup, thread_sensitive=False)
+_astore = sync_to_async(_store, thread_sensitive=False)
+_abegin_refresh = sync_to_async(_begin_refresh, thread_sensitive=False)
+_aend_refresh = sync_to_async(_end_refresh, thread_sensitive=False)
+
+
+async def afetch(namespace, key, build):
+    """fetch의 비동기 버전 (build는 (data, headers)를 반환하는 코루틴 함수)"""
+    if not is_enabled():
+        data, headers = await build()
+        return serialize(data), headers or {}
+
+    version, entry, stale = await _alookup(namespace, key)
+    if entry is not None:
+        if stale and await _abegin_refresh(namespace, key):
+            # 이벤트 루프가 task를 약한 참조로만 가지므로 완료될 때까지 보관한다
+            task = asyncio.create_task(_arefresh(namespace, key, build))
+            _tasks.add(task)
+            task.add_done_callback(_tasks.discard)
+        return entry[0], entry[1]
+
+    return await _astore(namespace, key, version, *(await build()))
+
+
+async def _arefresh(namespace, key, build):
+    error = None
+    try:
+        version = await sync_to_async(
+            _namespaces[namespace].version, thread_sensitive=False
+        )()
+        await _astore(namespace, key, version, *(await build()))
+    except Exception as e:
+        error = e
+    finally:
+        await _aend_refresh(namespace, key, error)
+
+
+def invalidate(*namespaces):
+    # 해당 목록의 모든 페이지를 무효화하고, 진행 중인 조회 결과도 읽히지 않도록 한다
+    for namespace in namespaces:
+        _namespaces[namespace].invalidate()
+
+
+def clear():
+    invalidate(*_namespaces)
+
+
+def stats():
+    # hits, misses는 stale 응답을 포함한 namespace별 집계
+    with _lock:
+        counters = dict(_counters)
+    return {
+        **counters,
+        "namespaces": {name: cache.stats() for name, cache in _namespaces.items()},
+        "ttl": _ttl(),
+        "stale_ttl": _stale_ttl(),
+    }
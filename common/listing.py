@@ -0,0 +1,41 @@
+# 목록 API에서 각 행에 대표 이미지 URL을 붙이는 헬퍼
+# images를 외래키(party_id/event_id) 기준으로 한 번만 순회해 dict로 만든 뒤 행마다 조회한다 (O(rows + images))
+
+
+def image_urls_query(client, foreign_key, ids):
+    # ids에 해당하는 이미지의 url과 외래키만 조회하는 쿼리 (동기/비동기 클라이언트 공용)
+    return client.table("images").select(f"url, {foreign_key}").in_(foreign_key, ids)
+
+
+def fetch_image_urls(client, foreign_key, ids):
+    # ids에 해당하는 이미지를 조회해 {id: url}로 반환한다
+    if not ids:
+        return {}
+
+    images = image_urls_query(client, foreign_key, list(ids)).execute().data
+    return index_image_urls(images, foreign_key)
+
+
+async def afetch_image_urls(client, foreign_key, ids):
+    # fetch_image_urls의 비동기 클라이언트 버전
+    if not ids:
+        return {}
+
+    images = (await image_urls_query(client, foreign_key, list(ids)).execute()).data
+    return index_image_urls(images, foreign_key)
+
+
+def index_image_urls(images, foreign_key):
+    # 같은 id의 이미지가 여러 개면 먼저 나온 이미지를 사용한다
+    image_urls = {}
+    for image in images:
+        image_urls.setdefault(image[foreign_key], image["url"])
+    return image_urls
+
+
+def attach_image_url(data, image_urls, row_id):
+    # 이미지가 있는 경우에만 image_url을 추가한다
+    image_url = image_urls.get(row_id)
+    if image_url is not None:
+        data["image_url"] = image_url
+    return data
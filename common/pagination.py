@@ -0,0 +1,36 @@
+# 목록 API의 keyset pagination 헬퍼
+# cursor는 마지막으로 반환한 행의 정렬 키 값들을 base64로 인코딩한 문자열이며,
+# 다음 페이지 cursor는 응답의 X-Next-Cursor 헤더로 전달한다
+import base64
+import json
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(*values):
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def get_page_size(request, default, maximum):
+    # DRF Request, Django HttpRequest 모두 GET으로 쿼리 파라미터를 읽을 수 있다
+    try:
+        page_size = int(request.GET.get("page_size", default))
+    except ValueError:
+        page_size = default
+    return max(1, min(page_size, maximum))
@@ -0,0 +1,62 @@
+# 엔드포인트별로 Supabase에서 조회할 컬럼 목록
+# select("*") 대신 응답 구성에 필요한 컬럼만 가져와 participant_ids, started_user_ids 같은
+# 큰 배열 컬럼이나 응답에 쓰이지 않는 컬럼(description, answer_key, password 등)의 전송을 줄인다
+# 뷰에서 새 필드를 응답에 추가할 때는 여기의 컬럼 목록도 함께 수정한다
+
+
+def columns(*names):
+    return ", ".join(names)
+
+
+# users
+AUTH_USER = columns("user_id", "email", "oauth_provider", "full_name")
+LOGIN_USER = columns("user_id", "email", "password", "oauth_provider", "full_name")
+USER_EXISTS = columns("user_id")
+USER_PROFILE = columns("nickname", "level", "coins", "num_events", "num_parties")
+
+# parties
+PARTIES_LIST = columns(
+    "id",
+    "created_at",
+    "title",
+    "destination",
+    "meet_at",
+    "participant_ids",
+    "max_users",
+    "coordinates",
+    "parking_spot",
+)
+PARTIES_MY = columns(PARTIES_LIST, "state")
+PARTY_END = columns("id", "organizer_id", "state")
+USER_HISTORY_PARTIES = columns("id")
+
+# events
+EVENTS_LIST = columns(
+    "id",
+    "created_at",
+    "title",
+    "host_name",
+    "destination",
+    "expiry",
+    "started_user_ids",
+    "completed_user_ids",
+    "max_users",
+    "coordinates",
+)
+EVENTS_MY = EVENTS_LIST
+EVENT_DETAIL = columns(
+    "id",
+    "host_name",
+    "destination",
+    "title",
+    "description",
+    "expiry",
+    "started_user_ids",
+    "completed_user_ids",
+    "max_users",
+    "coordinates",
+)
+USER_HISTORY_EVENTS = columns("id")
+
+# images
+IMAGE_URL = columns("url")
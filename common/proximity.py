@@ -0,0 +1,206 @@
+# 목록 API의 near=x,y&radius= 모드에서 사용하는 프로세스 단위 위치 인덱스
+# 활성 행(모집 중인 파티, 만료되지 않은 이벤트)의 id와 좌표(지도 이미지 위의 평면 좌표 [x, y])만 메모리에 보관하고,
+# 반경(좌표 단위) 안의 id를 거리순으로 찾은 뒤 해당 행만 Supabase에서 조회한다
+#
+# 갱신 방식 (PROXIMITY 설정)
+# - 같은 프로세스에서 생성한 행은 add로 바로 추가한다
+# - REFRESH_INTERVAL마다 DB에서 가져온 행 중 가장 큰 id보다 큰 활성 행만 가져와 추가한다 (증분)
+#   add로 추가한 행은 이 기준 id를 올리지 않으므로 다른 worker가 만든 더 작은 id의 행도 놓치지 않는다
+# - FULL_REFRESH_INTERVAL마다 활성 행 전체를 다시 읽어 비활성화된 행을 제거한다
+# - 조회는 lock 밖에서 하고 결과만 lock 안에서 반영하며, 한 번에 한 스레드만 갱신한다
+#   (다른 스레드는 갱신을 기다리지 않고 현재 인덱스로 검색한다)
+# 인덱스가 잠시 오래되어도 응답 행은 항상 활성 조건으로 다시 조회하므로 비활성 행은 응답에 포함되지 않는다
+import math
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+from django.conf import settings
+
+from . import geo
+from .projections import columns
+from .supabase_clients import get_service_client
+
+
+def _config():
+    return getattr(settings, "PROXIMITY", {})
+
+
+def parse_near(params):
+    """
+    near=x,y&radius= 쿼리 파라미터를 (x, y, radius)로 변환한다 (지도 좌표 단위)
+    near가 없으면 None, 형식이 잘못되면 ValueError
+    """
+    near = params.get("near")
+    if not near:
+        return None
+
+    try:
+        x, y = (float(value) for value in near.split(","))
+        radius = float(params.get("radius", _config().get("DEFAULT_RADIUS", 100)))
+    except ValueError:
+        raise ValueError("near는 'x,y', radius는 지도 좌표 단위 숫자여야 합니다.")
+    if not (math.isfinite(x) and math.isfinite(y)):
+        raise ValueError("near 좌표가 올바르지 않습니다.")
+    max_radius = _config().get("MAX_RADIUS", 1000)
+    if not 0 < radius <= max_radius:
+        raise ValueError(f"radius는 0보다 크고 {max_radius} 이하여야 합니다.")
+    return x, y, radius
+
+
+def _timestamp(value):
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+
+class ProximityIndex:
+    def __init__(self, table, active, expires_column=None):
+        # active: 활성 행 조건을 쿼리에 추가하는 함수 (query) -> query
+        # expires_column: 지정하면 검색 시 이 시간이 지난 행을 제외한다
+        self.table = table
+        self.active = active
+        self.expires_column = expires_column
+        self._lock = threading.Lock()
+        # 갱신 single-flight (한 번에 한 스레드만 Supabase를 조회한다)
+        self._refresh_lock = threading.Lock()
+        self._rows = {}  # id -> (x, y, expires_at)
+        self._arrays = None
+        self._max_id = 0  # DB에서 가져온 행의 가장 큰 id
+        self._refreshed_at = None
+        self._full_refreshed_at = None
+
+    def _query(self, client):
+        names = ["id", "coordinates"]
+        if self.expires_column:
+            names.append(self.expires_column)
+        return self.active(client.table(self.table).select(columns(*names)))
+
+    def _entry(self, row):
+        coordinates = row.get("coordinates") or []
+        if len(coordinates) != 2:
+            return None
+        expires_at = (
+            _timestamp(row.get(self.expires_column)) if self.expires_column else None
+        )
+        return float(coordinates[0]), float(coordinates[1]), expires_at
+
+    def _merge(self, rows):
+        for row in rows:
+            entry = self._entry(row)
+            if entry is not None:
+                self._rows[row["id"]] = entry
+        self._arrays = None
+
+    def add(self, row):
+        # 이 프로세스에서 생성한 행을 바로 반영한다 (증분 갱신 기준 id는 바꾸지 않는다)
+        with self._lock:
+            self._merge([row])
+
+    def discard(self, *ids):
+        with self._lock:
+            for row_id in ids:
+                self._rows.pop(row_id, None)
+            self._arrays = None
+
+    def refresh(self, full=False):
+        # Supabase 조회는 lock 밖에서 하고, 가져온 행만 lock 안에서 반영한다
+        client = get_service_client()
+        now = time.monotonic()
+        with self._lock:
+            max_id = self._max_id
+
+        query = self._query(client)
+        rows = (query if full else query.gt("id", max_id)).execute().data
+
+        with self._lock:
+            if full:
+                self._rows = {}
+                self._full_refreshed_at = now
+            self._merge(rows)
+            self._max_id = max([self._max_id] + [row["id"] for row in rows])
+            self._refreshed_at = now
+
+    def _due(self):
+        # 필요한 갱신 ("full", "incremental") 또는 None
+        config = _config()
+        now = time.monotonic()
+        with self._lock:
+            full_refreshed_at, refreshed_at = (
+                self._full_refreshed_at,
+                self._refreshed_at,
+            )
+        if full_refreshed_at is None or now - full_refreshed_at > config.get(
+            "FULL_REFRESH_INTERVAL", 300
+        ):
+            return "full"
+        if now - refreshed_at > config.get("REFRESH_INTERVAL", 10):
+            return "incremental"
+        return None
+
+    def _ensure_fresh(self):
+        if self._due() is None:
+            return
+
+        # 아직 한 번도 읽지 않았으면 갱신을 기다리고, 그 외에는 다른 스레드가 갱신 중이면 현재 인덱스를 사용한다
+        with self._lock:
+            loaded = self._full_refreshed_at is not None
+        if not self._refresh_lock.acquire(blocking=not loaded):
+            return
+        try:
+            due = self._due()
+            if due is not None:
+                self.refresh(full=due == "full")
+        finally:
+            self._refresh_lock.release()
+
+    def _get_arrays(self):
+        # x 순으로 정렬한 (ids, xs, ys, expires_at) 배열
+        with self._lock:
+            if self._arrays is None:
+                items = sorted(self._rows.items(), key=lambda item: item[1][0])
+                ids = np.array([row_id for row_id, _ in items], dtype=np.int64)
+                values = np.array(
+                    [
+                        (x, y, np.inf if expires_at is None else expires_at)
+                        for _, (x, y, expires_at) in items
+                    ],
+                    dtype=np.float64,
+                ).reshape(-1, 3)
+                self._arrays = (ids, values[:, 0], values[:, 1], values[:, 2])
+            return self._arrays
+
+    def search(self, x, y, radius, limit):
+        """
+        Returns [(id, distance)] within radius of (x, y), closest first
+
+        Distances are planar, in map coordinate units. Only rows in the band
+        [x - radius, x + radius] of the x-sorted arrays are considered;
+        geo.planar_nearest then narrows them by y before measuring distances.
+        """
+        self._ensure_fresh()
+        ids, xs, ys, expires_at = self._get_arrays()
+
+        start = np.searchsorted(xs, x - radius, side="left")
+        end = np.searchsorted(xs, x + radius, side="right")
+        live = start + np.flatnonzero(expires_at[start:end] > time.time())
+
+        indices, distances = geo.planar_nearest(
+            x, y, xs[live], ys[live], k=limit, radius=radius
+        )
+        return list(zip(ids[live][indices].tolist(), distances.tolist()))
+
+
+def candidate_limit(page_size):
+    # 인덱스가 오래되어 일부 후보가 비활성일 수 있으므로 페이지 크기의 2배까지 후보를 찾는다
+    return page_size * 2
+
+
+def order_by_distance(rows, matches, limit):
+    # search 결과 순서대로 행을 정렬하고 (row, distance) 목록을 반환한다
+    # 인덱스 이후에 비활성화되어 rows에 없는 id는 제외된다
+    rows_by_id = {row["id"]: row for row in rows}
+    return [
+        (rows_by_id[row_id], round(distance, 1))
+        for row_id, distance in matches
+        if row_id in rows_by_id
+    ][:limit]
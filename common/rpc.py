@@ -0,0 +1,11 @@
+# Supabase RPC(SQL 함수) 오류를 HTTP 상태 코드로 변환
+# SQL 함수는 대상이 없으면 P0002, 그 밖의 잘못된 요청은 P0001(raise exception)로 오류를 반환한다
+from rest_framework import status
+
+NOT_FOUND = "P0002"
+
+
+def error_status(error):
+    if error.code == NOT_FOUND:
+        return status.HTTP_404_NOT_FOUND
+    return status.HTTP_400_BAD_REQUEST
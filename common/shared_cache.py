@@ -0,0 +1,159 @@
+# Django cache framework(CACHES) 위의 namespace 단위 공유 캐시
+# 프로세스 단위 캐시는 gunicorn worker, fly.io machine마다 따로 생기므로
+# 사용자(principal), 목록, AI 응답 캐시는 이 모듈을 거쳐 CACHES 백엔드(파일 또는 Redis)에 저장한다
+# - 키는 "<namespace>:<namespace 버전>:<key>" 형식이고, 전체 키 버전은 CACHES의 VERSION(CACHE_VERSION)을 따른다
+# - invalidate()는 namespace 버전을 올려 이전 버전의 키를 모든 worker에서 한 번에 무효화한다
+#   (이전 항목은 timeout이 지나거나 백엔드가 정리할 때 제거된다)
+# - namespace별 hits / misses / sets와 백엔드 evictions를 stats()로 확인한다 (프로세스 단위 집계)
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+
+_lock = threading.Lock()
+COUNTERS = ("hits", "misses", "sets", "deletes", "invalidations")
+
+_counters = {}  # namespace -> {counter: n}
+_evictions = {"count": 0}
+
+
+class CountingFileBasedCache(FileBasedCache):
+    # MAX_ENTRIES를 넘어 _cull이 제거한 파일 수를 evictions로 센다
+    # (Django는 스레드마다 캐시 인스턴스를 따로 만들므로 _culling은 인스턴스 속성으로 충분하다)
+    _culling = False
+
+    def _cull(self):
+        self._culling = True
+        try:
+            super()._cull()
+        finally:
+            self._culling = False
+
+    def _delete(self, fname):
+        deleted = super()._delete(fname)
+        if deleted and self._culling:
+            with _lock:
+                _evictions["count"] += 1
+        return deleted
+
+
+def _cache(alias=None):
+    return caches[alias or getattr(settings, "SHARED_CACHE_ALIAS", "default")]
+
+
+def _count(namespace, counter):
+    with _lock:
+        counters = _counters.setdefault(namespace, dict.fromkeys(COUNTERS, 0))
+        counters[counter] += 1
+
+
+def _with_hit_rate(counters):
+    lookups = counters["hits"] + counters["misses"]
+    return {**counters, "hit_rate": counters["hits"] / lookups if lookups else 0.0}
+
+
+def _new_version():
+    # 버전 키가 백엔드에서 제거된 뒤 다시 만들어져도 이전 버전 번호와 겹치지 않도록 현재 시각(ms)을 사용한다
+    return int(time.time() * 1000)
+
+
+class Namespace:
+    """
+    CACHES 백엔드의 키 공간 하나
+
+    get/set/delete의 key는 namespace 안에서의 키(str)이고,
+    version을 생략하면 현재 namespace 버전을 사용한다.
+    alias를 지정하면 기본 캐시 대신 CACHES[alias]에 저장한다 (항목 수 제한을 따로 둘 때).
+    """
+
+    def __init__(self, name, timeout, alias=None):
+        self.name = name
+        self.timeout = timeout
+        self.alias = alias
+        self._version_key = f"{name}:version"
+
+    def _cache(self):
+        return _cache(self.alias)
+
+    def version(self):
+        cache = self._cache()
+        version = cache.get(self._version_key)
+        if version is None:
+            cache.add(self._version_key, _new_version(), timeout=None)
+            version = cache.get(self._version_key)
+        return version
+
+    def _key(self, key, version):
+        return f"{self.name}:{version}:{key}"
+
+    def get(self, key, version=None):
+        value = self._cache().get(self._key(key, version or self.version()))
+        _count(self.name, "misses" if value is None else "hits")
+        return value
+
+    def set(self, key, value, timeout=None, version=None):
+        self._cache().set(
+            self._key(key, version or self.version()),
+            value,
+            timeout=self.timeout if timeout is None else timeout,
+        )
+        _count(self.name, "sets")
+
+    def add(self, key, value, timeout=None):
+        # 키가 없을 때만 저장하고 저장했으면 True (여러 worker 중 한 곳만 작업하도록 할 때 사용)
+        return self._cache().add(
+            self._key(key, self.version()),
+            value,
+            timeout=self.timeout if timeout is None else timeout,
+        )
+
+    def delete(self, key):
+        self._cache().delete(self._key(key, self.version()))
+        _count(self.name, "deletes")
+
+    def invalidate(self):
+        cache = self._cache()
+        try:
+            cache.incr(self._version_key)
+        except ValueError:
+            # 버전 키가 없으면 새 버전으로 시작한다
+            cache.set(self._version_key, _new_version(), timeout=None)
+        _count(self.name, "invalidations")
+
+    def stats(self):
+        # 이 프로세스에서 집계한 hits, misses, sets, deletes, invalidations, hit_rate
+        with _lock:
+            counters = dict(_counters.get(self.name) or dict.fromkeys(COUNTERS, 0))
+        return _with_hit_rate(counters)
+
+
+def _backend_evictions():
+    # Redis는 서버가 maxmemory 정책으로 제거한 키 수(evicted_keys)를 사용한다
+    cache = _cache()
+    if isinstance(cache, FileBasedCache):
+        with _lock:
+            return _evictions["count"]
+    client = getattr(getattr(cache, "_cache", None), "get_client", None)
+    if client is None:
+        return None
+    try:
+        return client().info("stats").get("evicted_keys")
+    except Exception as e:
+        print(f"Failed to read cache evictions: {e}")
+        return None
+
+
+def stats():
+    # {"backend": ..., "evictions": n, "namespaces": {"principal": {"hits", "misses", ..., "hit_rate"}}}
+    with _lock:
+        namespaces = {
+            name: _with_hit_rate(counters) for name, counters in _counters.items()
+        }
+    cache = _cache()
+    return {
+        "backend": f"{type(cache).__module__}.{type(cache).__name__}",
+        "evictions": _backend_evictions(),
+        "namespaces": namespaces,
+    }
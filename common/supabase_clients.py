@@ -0,0 +1,191 @@
+# 프로세스 단위로 공유하는 Supabase 클라이언트 registry
+# 모듈마다 create_client를 호출하면 worker마다 클라이언트와 커넥션 풀이 모듈 수만큼 생기므로,
+# anon / service role 클라이언트를 처음 사용할 때 한 번만 만들고 이후에는 같은 인스턴스를 반환한다
+# PostgREST, Storage 요청은 SUPABASE_HTTP 설정(커넥션 풀 크기, keep-alive, HTTP/2, timeout)을 따르는 httpx 클라이언트를 사용한다
+import asyncio
+import threading
+
+import httpx
+from django.conf import settings
+from postgrest import AsyncPostgrestClient, SyncPostgrestClient
+from postgrest.utils import AsyncClient as AsyncPostgrestSession
+from postgrest.utils import SyncClient as PostgrestSession
+from storage3 import AsyncStorageClient, SyncStorageClient
+from storage3.utils import AsyncClient as AsyncStorageSession
+from storage3.utils import SyncClient as StorageSession
+from supabase import AsyncClient, Client
+
+ANON = "anon"
+SERVICE_ROLE = "service_role"
+
+_clients = {}
+_async_clients = {}
+_lock = threading.Lock()
+# 첫 요청들이 동시에 들어와도 비동기 클라이언트를 한 번만 만들도록 한다
+_async_lock = asyncio.Lock()
+
+
+def _http_options(timeout_key):
+    config = settings.SUPABASE_HTTP
+    return {
+        "timeout": httpx.Timeout(
+            config[timeout_key], connect=config["CONNECT_TIMEOUT"]
+        ),
+        "limits": httpx.Limits(
+            max_connections=config["MAX_CONNECTIONS"],
+            max_keepalive_connections=config["MAX_KEEPALIVE_CONNECTIONS"],
+            keepalive_expiry=config["KEEPALIVE_EXPIRY"],
+        ),
+        "http2": config["HTTP2"],
+        "follow_redirects": True,
+    }
+
+
+class _PooledPostgrestClient(SyncPostgrestClient):
+    def create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return PostgrestSession(
+            base_url=base_url,
+            headers=headers,
+            verify=verify,
+            proxy=proxy,
+            **_http_options("TIMEOUT"),
+        )
+
+
+class _PooledStorageClient(SyncStorageClient):
+    def _create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return StorageSession(
+            base_url=base_url,
+            headers=headers,
+            verify=bool(verify),
+            proxy=proxy,
+            **_http_options("STORAGE_TIMEOUT"),
+        )
+
+
+class PooledClient(Client):
+    @staticmethod
+    def _init_postgrest_client(
+        rest_url, headers, schema, timeout=None, verify=True, proxy=None
+    ):
+        return _PooledPostgrestClient(
+            rest_url, headers=headers, schema=schema, verify=verify, proxy=proxy
+        )
+
+    @staticmethod
+    def _init_storage_client(
+        storage_url, headers, storage_client_timeout=None, verify=True, proxy=None
+    ):
+        return _PooledStorageClient(storage_url, headers, verify=verify, proxy=proxy)
+
+
+class _PooledAsyncPostgrestClient(AsyncPostgrestClient):
+    def create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return AsyncPostgrestSession(
+            base_url=base_url,
+            headers=headers,
+            verify=verify,
+            proxy=proxy,
+            **_http_options("TIMEOUT"),
+        )
+
+
+class _PooledAsyncStorageClient(AsyncStorageClient):
+    def _create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return AsyncStorageSession(
+            base_url=base_url,
+            headers=headers,
+            verify=bool(verify),
+            proxy=proxy,
+            **_http_options("STORAGE_TIMEOUT"),
+        )
+
+
+class PooledAsyncClient(AsyncClient):
+    @staticmethod
+    def _init_postgrest_client(
+        rest_url, headers, schema, timeout=None, verify=True, proxy=None
+    ):
+        return _PooledAsyncPostgrestClient(
+            rest_url, headers=headers, schema=schema, verify=verify, proxy=proxy
+        )
+
+    @staticmethod
+    def _init_storage_client(
+        storage_url, headers, storage_client_timeout=None, verify=True, proxy=None
+    ):
+        return _PooledAsyncStorageClient(
+            storage_url, headers, verify=verify, proxy=proxy
+        )
+
+
+def _get(role, key):
+    client = _clients.get(role)
+    if client is None:
+        with _lock:
+            client = _clients.get(role)
+            if client is None:
+                client = PooledClient.create(settings.SUPABASE_URL, key)
+                _clients[role] = client
+    return client
+
+
+def get_client():
+    # anon key 클라이언트 (RLS 적용)
+    return _get(ANON, settings.SUPABASE_KEY)
+
+
+def get_service_client():
+    # service role key 클라이언트 (RLS 우회, 서버 내부 작업용)
+    return _get(SERVICE_ROLE, settings.SUPABASE_SERVICE_ROLE_KEY)
+
+
+async def _aget(role, key):
+    # 비동기 클라이언트는 ASGI worker의 이벤트 루프에서만 사용한다 (async_views)
+    client = _async_clients.get(role)
+    if client is not None:
+        return client
+    async with _async_lock:
+        client = _async_clients.get(role)
+        if client is None:
+            client = await PooledAsyncClient.create(settings.SUPABASE_URL, key)
+            _async_clients[role] = client
+    return client
+
+
+async def aget_client():
+    return await _aget(ANON, settings.SUPABASE_KEY)
+
+
+async def aget_service_client():
+    return await _aget(SERVICE_ROLE, settings.SUPABASE_SERVICE_ROLE_KEY)
+
+
+def _session_stats(session):
+    pool = getattr(getattr(session, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return {
+        "connections": len(connections),
+        "idle": idle,
+        "active": len(connections) - idle,
+        "max_connections": getattr(pool, "_max_connections", None),
+        "closed": session.is_closed,
+    }
+
+
+def pool_stats():
+    # {"service_role": {"postgrest": {...}, "storage": {...}}, ...}
+    # 아직 한 번도 사용하지 않은 클라이언트/서비스는 포함하지 않는다
+    # 비동기 클라이언트는 "async_" 접두사를 붙여 구분한다
+    stats = {}
+    clients = [(role, client) for role, client in _clients.items()]
+    clients += [(f"async_{role}", client) for role, client in _async_clients.items()]
+    for role, client in clients:
+        role_stats = {}
+        for name in ("postgrest", "storage"):
+            service = getattr(client, f"_{name}", None)
+            if service is not None:
+                role_stats[name] = _session_stats(service.session)
+        stats[role] = role_stats
+    return stats
@@ -0,0 +1,133 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from authorize.custom_user import CustomUser
+from authorize.principal_cache import PRINCIPAL_FIELDS
+from events import views as event_views
+from events.queries import serialize_event_summary
+from parties import views as party_views
+from parties.queries import serialize_party_summary
+from users import views as user_views
+
+from . import projections
+
+USER_ID = "user-1"
+
+# 컬럼별 예시 값, 조회한 행에는 select한 컬럼만 담기므로 응답 구성에 없는 컬럼을 읽으면 KeyError가 발생한다
+SAMPLE_VALUES = {
+    "id": 1,
+    "created_at": "2026-10-17T00:00:00+00:00",
+    "title": "title",
+    "description": "description",
+    "destination": "destination",
+    "host_name": "host",
+    "meet_at": "meet_at",
+    "expiry": "2099-01-01T00:00:00+00:00",
+    "organizer_id": USER_ID,
+    "participant_ids": [USER_ID],
+    "started_user_ids": [],
+    "completed_user_ids": [USER_ID],
+    "max_users": 4,
+    "coordinates": [100, 200],
+    "parking_spot": [110, 210],
+    "state": 0,
+    "answer_key": "answer",
+    "url": "http://image",
+    "party_id": 1,
+    "event_id": 1,
+    "user_id": USER_ID,
+    "email": "user@example.com",
+    "password": "password",
+    "oauth_provider": "email",
+    "full_name": None,
+    "nickname": "nickname",
+    "level": 1,
+    "coins": 0,
+    "num_events": 0,
+    "num_parties": 0,
+}
+
+
+def names(projection):
+    return [name.strip() for name in projection.split(",")]
+
+
+def row(projection):
+    return {name: SAMPLE_VALUES[name] for name in names(projection)}
+
+
+class FakeQuery:
+    # select한 컬럼만 담은 행 하나를 반환하는 Supabase 쿼리 대역
+    def __init__(self):
+        self.projection = None
+        self.single_row = False
+
+    def select(self, projection):
+        self.projection = projection
+        return self
+
+    def single(self):
+        self.single_row = True
+        return self
+
+    def __getattr__(self, name):
+        # eq, in_, or_, order 등 필터는 결과에 영향을 주지 않는다
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        data = row(self.projection)
+        return mock.Mock(data=data if self.single_row else [data])
+
+
+class FakeClient:
+    def table(self, name):
+        return FakeQuery()
+
+
+class ProjectionTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = CustomUser({"user_id": USER_ID, "email": "user@example.com"})
+
+    def get(self, view, module, *args):
+        request = self.factory.get("/")
+        force_authenticate(request, user=self.user)
+        with mock.patch.object(module, "supabase", FakeClient()):
+            response = view(request, *args)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_party_summary(self):
+        data = serialize_party_summary(
+            row(projections.PARTIES_LIST), {1: "http://image"}
+        )
+        self.assertEqual(data["image_url"], "http://image")
+
+    def test_event_summary(self):
+        data = serialize_event_summary(row(projections.EVENTS_LIST), {})
+        self.assertEqual(data["remaining_num"], 3)
+
+    def test_parties_my(self):
+        (party,) = self.get(party_views.parties_my, party_views)
+        self.assertEqual(party["image_url"], "http://image")
+
+    def test_events_my(self):
+        (event,) = self.get(event_views.events_my, event_views)
+        self.assertEqual(event["num_completed"], 1)
+
+    def test_events_detail(self):
+        event = self.get(event_views.events_detail, event_views, 1)
+        self.assertEqual(event["status"], "completed")
+
+    def test_user_profile(self):
+        profile = self.get(user_views.user_profile, user_views)
+        self.assertEqual(profile["nickname"], "nickname")
+
+    def test_principal_fields(self):
+        self.assertLessEqual(set(PRINCIPAL_FIELDS), set(names(projections.AUTH_USER)))
+        self.assertLessEqual(
+            set(names(projections.AUTH_USER)) | {"password"},
+            set(names(projections.LOGIN_USER)),
+        )
@@ -0,0 +1,32 @@
+-- parties_detail에서 사용하는 파티 상세 조회 함수
+-- 파티, 주최자 닉네임, 참가자 닉네임, 이미지 URL을 한 번의 왕복으로 가져온다
+create or replace function public.party_detail(p_party_id bigint)
+returns jsonb
+language sql
+stable
+as $$
+  select jsonb_build_object(
+    'party', to_jsonb(p),
+    'organizer', (
+      select jsonb_build_object('nickname', u.nickname)
+      from public.users u
+      where u.user_id::text = p.organizer_id::text
+    ),
+    'participants', coalesce(
+      (
+        select jsonb_agg(jsonb_build_object('user_id', u.user_id, 'nickname', u.nickname))
+        from public.users u
+        where u.user_id::text = any(p.participant_ids::text[])
+      ),
+      '[]'::jsonb
+    ),
+    'image_url', (
+      select i.url
+      from public.images i
+      where i.party_id = p.id
+      limit 1
+    )
+  )
+  from public.parties p
+  where p.id = p_party_id;
+$$;
@@ -0,0 +1,23 @@
+-- 파티 종료, 이벤트 완료 시 사용자 보상(level, num_parties, num_events)을 한 번의 UPDATE로 지급하는 함수
+-- 읽고-수정하고-쓰는 과정 없이 DB에서 증가시키므로 동시에 종료되는 파티끼리 증가분이 유실되지 않는다
+-- 같은 사용자가 p_user_ids에 여러 번 있어도 한 번만 지급한다
+-- party_finish, event_complete 함수가 같은 트랜잭션 안에서 호출한다
+create or replace function public.reward_users(
+  p_user_ids text[],
+  p_level integer default 0,
+  p_num_parties integer default 0,
+  p_num_events integer default 0
+)
+returns integer
+language sql
+as $$
+  with updated as (
+    update public.users
+    set level = coalesce(level, 0) + p_level,
+        num_parties = coalesce(num_parties, 0) + p_num_parties,
+        num_events = coalesce(num_events, 0) + p_num_events
+    where user_id::text = any(p_user_ids)
+    returning 1
+  )
+  select count(*)::integer from updated;
+$$;
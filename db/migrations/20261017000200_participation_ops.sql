@@ -0,0 +1,171 @@
+-- 파티 참가/출발/운행 종료, 이벤트 참여/완료 시 배열 컬럼을 DB에서 직접 수정하는 함수
+-- 행 잠금(for update) 후 검사와 array_append/array_remove를 수행하므로
+-- 동시에 여러 사용자가 참가해도 참가 내역이 유실되거나 정원을 넘지 않는다
+-- 사용자 id는 party_detail, reward_users와 같이 text로 받아 ::text로 비교하고,
+-- 컬럼 타입(uuid[] 또는 text[])의 plpgsql 변수에 대입하여 변환한 뒤 저장한다
+-- 오류는 P0002(대상 없음, PostgREST 404) 또는 P0001(잘못된 요청, PostgREST 400)로 반환한다
+
+-- 이전에 uuid 인자로 만든 함수가 있으면 text 버전과 함께 남지 않도록 제거한다
+drop function if exists public.party_join(bigint, uuid);
+drop function if exists public.party_start(bigint, uuid);
+drop function if exists public.party_endride(bigint, uuid);
+drop function if exists public.event_join(bigint, uuid);
+
+create or replace function public.party_join(p_party_id bigint, p_user_id text)
+returns jsonb
+language plpgsql
+as $$
+declare
+  v_party public.parties%rowtype;
+  v_participant_ids public.parties.participant_ids%type;
+begin
+  select * into v_party from public.parties where id = p_party_id for update;
+  if not found then
+    raise exception 'Party not found' using errcode = 'P0002';
+  end if;
+  if v_party.state <> 0 then
+    raise exception 'Party is not recruiting';
+  end if;
+  if v_party.max_users <= coalesce(cardinality(v_party.participant_ids), 0) then
+    raise exception 'Party is full';
+  end if;
+  if p_user_id = any(v_party.participant_ids::text[])
+     or p_user_id = v_party.organizer_id::text then
+    raise exception 'User already joined';
+  end if;
+
+  v_participant_ids := array_append(coalesce(v_party.participant_ids::text[], '{}'), p_user_id);
+  update public.parties
+  set participant_ids = v_participant_ids
+  where id = p_party_id;
+
+  return jsonb_build_object('participant_ids', v_participant_ids);
+end;
+$$;
+
+create or replace function public.party_start(p_party_id bigint, p_user_id text)
+returns jsonb
+language plpgsql
+as $$
+declare
+  v_party public.parties%rowtype;
+  v_omw_ids public.parties.omw_ids%type;
+begin
+  select * into v_party from public.parties where id = p_party_id for update;
+  if not found then
+    raise exception 'Party not found' using errcode = 'P0002';
+  end if;
+  if v_party.state = 1 then
+    raise exception 'Party is already finished';
+  end if;
+
+  v_omw_ids := v_party.omw_ids;
+  if not coalesce(p_user_id = any(v_party.omw_ids::text[]), false) then
+    v_omw_ids := array_append(coalesce(v_party.omw_ids::text[], '{}'), p_user_id);
+    update public.parties
+    set omw_ids = v_omw_ids
+    where id = p_party_id;
+  end if;
+
+  return jsonb_build_object('omw_ids', v_omw_ids);
+end;
+$$;
+
+-- parties_endride 응답이 파티 전체를 사용하므로 변경 후 파티 행을 반환한다
+create or replace function public.party_endride(p_party_id bigint, p_user_id text)
+returns jsonb
+language plpgsql
+as $$
+declare
+  v_party public.parties%rowtype;
+  v_omw_ids public.parties.omw_ids%type;
+  v_finished_ids public.parties.finished_ids%type;
+begin
+  select * into v_party from public.parties where id = p_party_id for update;
+  if not found then
+    raise exception 'Party not found' using errcode = 'P0002';
+  end if;
+
+  if coalesce(p_user_id = any(v_party.omw_ids::text[]), false) then
+    v_omw_ids := array_remove(v_party.omw_ids::text[], p_user_id);
+    v_finished_ids := array_append(coalesce(v_party.finished_ids::text[], '{}'), p_user_id);
+    update public.parties
+    set omw_ids = v_omw_ids,
+        finished_ids = v_finished_ids
+    where id = p_party_id
+    returning * into v_party;
+  end if;
+
+  return to_jsonb(v_party);
+end;
+$$;
+
+create or replace function public.event_join(p_event_id bigint, p_user_id text)
+returns jsonb
+language plpgsql
+as $$
+declare
+  v_event public.events%rowtype;
+  v_started_user_ids public.events.started_user_ids%type;
+begin
+  select * into v_event from public.events where id = p_event_id for update;
+  if not found then
+    raise exception 'Event not found' using errcode = 'P0002';
+  end if;
+
+  v_started_user_ids := v_event.started_user_ids;
+  if not coalesce(p_user_id = any(v_event.started_user_ids::text[]), false)
+     and not coalesce(p_user_id = any(v_event.completed_user_ids::text[]), false) then
+    if v_event.max_users <= coalesce(cardinality(v_event.started_user_ids), 0)
+                            + coalesce(cardinality(v_event.completed_user_ids), 0) then
+      raise exception 'Event is full';
+    end if;
+
+    v_started_user_ids := array_append(coalesce(v_event.started_user_ids::text[], '{}'), p_user_id);
+    update public.events
+    set started_user_ids = v_started_user_ids
+    where id = p_event_id;
+  end if;
+
+  return jsonb_build_object('started_user_ids', v_started_user_ids);
+end;
+$$;
+
+-- 정답을 확인한 뒤 started_user_ids에서 completed_user_ids로 옮기고, 같은 트랜잭션에서 보상(level +5, num_events +1)을 지급한다
+-- 이미 완료한 사용자는 'Event already completed'로 거절하므로 반복 호출해도 보상이 다시 지급되지 않는다
+create or replace function public.event_complete(
+  p_event_id bigint,
+  p_user_id text,
+  p_answer_key text
+)
+returns jsonb
+language plpgsql
+as $$
+declare
+  v_event public.events%rowtype;
+  v_started_user_ids public.events.started_user_ids%type;
+  v_completed_user_ids public.events.completed_user_ids%type;
+begin
+  select * into v_event from public.events where id = p_event_id for update;
+  if not found then
+    raise exception 'Event not found' using errcode = 'P0002';
+  end if;
+  if v_event.answer_key is distinct from p_answer_key then
+    raise exception 'Incorrect answer key';
+  end if;
+  if coalesce(p_user_id = any(v_event.completed_user_ids::text[]), false) then
+    raise exception 'Event already completed';
+  end if;
+
+  v_started_user_ids := array_remove(coalesce(v_event.started_user_ids::text[], '{}'), p_user_id);
+  v_completed_user_ids := array_append(coalesce(v_event.completed_user_ids::text[], '{}'), p_user_id);
+  update public.events
+  set started_user_ids = v_started_user_ids,
+      completed_user_ids = v_completed_user_ids
+  where id = p_event_id;
+
+  perform public.reward_users(array[p_user_id], 5, 0, 1);
+
+  return jsonb_build_object('completed_user_ids', v_completed_user_ids);
+end;
+$$;
@@ -0,0 +1,27 @@
+-- 파티 종료 작업(parties/tasks.py end_party)에서 사용하는 파티 종료 함수
+-- state가 0인 파티만 1로 바꾸고, 같은 트랜잭션에서 출발한(omw_ids) 사용자에게 보상(level +5, num_parties +1)을 지급한다
+-- 이미 종료된 파티는 아무것도 바꾸지 않고 finished = false를 반환하므로 작업이 재시도되어도 보상이 다시 지급되지 않는다
+create or replace function public.party_finish(p_party_id bigint)
+returns jsonb
+language plpgsql
+as $$
+declare
+  v_omw_ids text[];
+begin
+  update public.parties
+  set state = 1
+  where id = p_party_id and state = 0
+  returning coalesce(omw_ids::text[], '{}') into v_omw_ids;
+
+  if not found then
+    if not exists (select 1 from public.parties where id = p_party_id) then
+      raise exception 'Party not found' using errcode = 'P0002';
+    end if;
+    return jsonb_build_object('finished', false, 'omw_ids', '[]'::jsonb);
+  end if;
+
+  perform public.reward_users(v_omw_ids, 5, 1, 0);
+
+  return jsonb_build_object('finished', true, 'omw_ids', to_jsonb(v_omw_ids));
+end;
+$$;
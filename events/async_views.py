@@ -0,0 +1,97 @@
+# ASGI 모드(settings.ASYNC_VIEWS)에서 사용하는 events 비동기 view
+# 쿼리와 직렬화는 views와 같은 함수(queries.py)를 사용하고, 요청만 비동기 Supabase 클라이언트로 보낸다
+import functools
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.views.decorators.http import require_GET
+
+from authorize.async_authentication import authenticated
+from common import list_cache
+from common.async_http import json_response
+from common.listing import afetch_image_urls
+from common.pagination import NEXT_CURSOR_HEADER, InvalidCursor, get_page_size
+from common.proximity import candidate_limit, order_by_distance, parse_near
+from common.supabase_clients import aget_service_client
+
+from .queries import (
+    active_events_by_id_query,
+    active_events_index,
+    active_events_query,
+    serialize_event_summary,
+    split_page,
+)
+
+
+@require_GET
+@authenticated
+async def events_list(request):
+    try:
+        near = parse_near(request.GET)
+    except ValueError as e:
+        return json_response({"error": str(e)}, status=400)
+
+    try:
+        supabase = await aget_service_client()
+        if near is not None:
+            return await _nearby_events(supabase, request, near)
+
+        page_size = get_page_size(
+            request, settings.EVENTS_PAGE_SIZE, settings.EVENTS_PAGE_SIZE_MAX
+        )
+        cursor = request.GET.get("cursor")
+
+        body, headers = await list_cache.afetch(
+            list_cache.EVENTS,
+            f"{page_size}:{cursor or ''}",
+            functools.partial(_active_events, supabase, page_size, cursor),
+        )
+        return list_cache.response(body, headers)
+    except InvalidCursor as e:
+        return json_response({"error": str(e)}, status=400)
+    except Exception as e:
+        return json_response(
+            {"error": f"이벤트 목록 조회 중 오류가 발생했습니다: {str(e)}"}, status=500
+        )
+
+
+async def _active_events(supabase, page_size, cursor):
+    # views._active_events의 비동기 버전
+    # 만료되지 않은 이벤트만 (expiry, id) 순으로 가져온다
+    query = active_events_query(supabase, page_size, cursor)
+    events, next_cursor = split_page((await query.execute()).data, page_size)
+
+    # 해당하는 이벤트의 이미지를 가져온다
+    image_urls = await afetch_image_urls(
+        supabase, "event_id", [event["id"] for event in events]
+    )
+
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return [serialize_event_summary(event, image_urls) for event in events], headers
+
+
+async def _nearby_events(supabase, request, near):
+    # views._nearby_events의 비동기 버전
+    # 인덱스 갱신은 동기 클라이언트를 사용하므로 스레드에서 실행한다
+    page_size = get_page_size(
+        request, settings.PROXIMITY["PAGE_SIZE"], settings.PROXIMITY["PAGE_SIZE_MAX"]
+    )
+    matches = await sync_to_async(active_events_index.search, thread_sensitive=False)(
+        *near, candidate_limit(page_size)
+    )
+    if not matches:
+        return json_response([])
+
+    rows = active_events_by_id_query(supabase, [event_id for event_id, _ in matches])
+    events = order_by_distance((await rows.execute()).data, matches, page_size)
+
+    image_urls = await afetch_image_urls(
+        supabase, "event_id", [event["id"] for event, _ in events]
+    )
+
+    return json_response(
+        [
+            {**serialize_event_summary(event, image_urls), "distance": distance}
+            for event, distance in events
+        ]
+    )
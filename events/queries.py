@@ -0,0 +1,95 @@
+# events 관련 Supabase 조회 함수
+# SQL 함수 정의는 db/migrations 참고
+# 목록 쿼리 빌더와 직렬화 함수는 동기 views와 비동기 async_views가 함께 사용한다
+from datetime import datetime
+
+from common import projections
+from common.listing import attach_image_url
+from common.pagination import InvalidCursor, decode_cursor, encode_cursor
+from common.proximity import ProximityIndex
+
+
+def _active(query):
+    return query.gt("expiry", datetime.now().isoformat())
+
+
+# 만료되지 않은 이벤트의 위치 인덱스 (events_list near 모드)
+active_events_index = ProximityIndex("events", _active, expires_column="expiry")
+
+
+def active_events_query(client, page_size, cursor=None):
+    # 만료되지 않은 이벤트를 (expiry, id) 순으로 page_size + 1개 조회하는 쿼리
+    # cursor가 올바르지 않으면 InvalidCursor
+    query = _active(client.table("events").select(projections.EVENTS_LIST))
+    if cursor:
+        expiry, last_id = decode_cursor(cursor, 2)
+        try:
+            expiry = datetime.fromisoformat(expiry).isoformat()
+            last_id = int(last_id)
+        except (TypeError, ValueError):
+            raise InvalidCursor("Invalid cursor")
+        query = query.or_(
+            f'expiry.gt."{expiry}",and(expiry.eq."{expiry}",id.gt.{last_id})'
+        )
+    return (
+        query.order("expiry", desc=False).order("id", desc=False).limit(page_size + 1)
+    )
+
+
+def active_events_by_id_query(client, event_ids):
+    # near 모드에서 인덱스가 찾은 이벤트 중 만료되지 않은 이벤트만 조회하는 쿼리
+    return _active(
+        client.table("events").select(projections.EVENTS_LIST).in_("id", event_ids)
+    )
+
+
+def split_page(events, page_size):
+    # page_size보다 많이 조회되면 다음 페이지가 있다
+    # (page, next_cursor | None)
+    if len(events) <= page_size:
+        return events, None
+    events = events[:page_size]
+    return events, encode_cursor(events[-1]["expiry"], events[-1]["id"])
+
+
+def serialize_event_summary(event, image_urls):
+    data = {
+        "id": event["id"],
+        "created_at": event["created_at"],
+        "title": event["title"],
+        "host_name": event["host_name"],
+        "destination": event["destination"],
+        "expiry": event["expiry"],
+        "num_started": len(event["started_user_ids"]),
+        "num_completed": len(event["completed_user_ids"]),
+        "remaining_num": event["max_users"]
+        - len(event["started_user_ids"])
+        - len(event["completed_user_ids"]),
+        "coordinates": event["coordinates"],
+    }
+
+    # 이미지 추가
+    return attach_image_url(data, image_urls, event["id"])
+
+
+def join_event(client, event_id, user_id):
+    # 정원과 중복 참여를 검사한 뒤 started_user_ids에 추가한다
+    # {"started_user_ids": [...]}
+    return (
+        client.rpc("event_join", {"p_event_id": event_id, "p_user_id": user_id})
+        .execute()
+        .data
+    )
+
+
+def complete_event(client, event_id, user_id, answer_key):
+    # 정답과 중복 완료를 검사한 뒤 completed_user_ids로 옮기고 보상(level +5, num_events +1)을 지급한다
+    # {"completed_user_ids": [...]}
+    return (
+        client.rpc(
+            "event_complete",
+            {"p_event_id": event_id, "p_user_id": user_id, "p_answer_key": answer_key},
+        )
+        .execute()
+        .data
+    )
@@ -1,12 +1,16 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import async_views, views
+
+# ASGI 모드에서는 I/O 대기 시간이 긴 view를 비동기 버전으로 처리한다
+hot_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
     path("create/", views.events_create, name="events_create"),
     path("<int:event_id>/", views.events_detail, name="events_detail"),
     path("<int:event_id>/join/", views.events_join, name="events_join"),
     path("<int:event_id>/complete/", views.events_complete, name="events_complete"),
-    path("", views.events_list, name="events"),
+    path("", hot_views.events_list, name="events"),
     path("my/", views.events_my, name="events_my"),
 ]
@@ -1,3 +1,4 @@
+import functools
 import random
 import uuid
 from datetime import datetime
@@ -5,24 +6,74 @@ from datetime import datetime
 from django.conf import settings
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
+from postgrest.exceptions import APIError
 from rest_framework import status
 from rest_framework.decorators import api_view, parser_classes, permission_classes
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from supabase import Client, create_client
-
-# Supabase 클라이언트 설정
-supabase: Client = create_client(
-    settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY
+from supabase import Client
+
+from authorize import principal_cache
+from common import list_cache, projections
+from common.concurrency import gather
+from common.listing import fetch_image_urls
+from common.pagination import NEXT_CURSOR_HEADER, InvalidCursor, get_page_size
+from common.proximity import candidate_limit, order_by_distance, parse_near
+from common.rpc import error_status
+from common.supabase_clients import get_service_client
+
+from .queries import (
+    active_events_by_id_query,
+    active_events_index,
+    active_events_query,
+    complete_event,
+    join_event,
+    serialize_event_summary,
+    split_page,
 )
 
+# Supabase 클라이언트 (프로세스 단위로 공유)
+supabase: Client = get_service_client()
+
 
 @swagger_auto_schema(
     method="GET",
     tags=["events"],
     operation_summary="이벤트 목록 조회",
-    operation_description="만료되지 않은 모든 이벤트의 목록을 조회합니다.",
+    operation_description="만료되지 않은 이벤트의 목록을 마감 시간 순으로 조회합니다. "
+    "다음 페이지가 있으면 X-Next-Cursor 응답 헤더 값을 cursor로 전달합니다. "
+    "near를 지정하면 반경 안의 이벤트를 가까운 순으로 page_size개까지 조회합니다 (cursor 미사용).",
+    manual_parameters=[
+        openapi.Parameter(
+            "near",
+            in_=openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="검색 중심 지도 좌표 'x,y' (optional)",
+            required=False,
+        ),
+        openapi.Parameter(
+            "radius",
+            in_=openapi.IN_QUERY,
+            type=openapi.TYPE_NUMBER,
+            description="near 모드 검색 반경 (지도 좌표 단위)",
+            required=False,
+        ),
+        openapi.Parameter(
+            "cursor",
+            in_=openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="이전 응답의 X-Next-Cursor 헤더 값",
+            required=False,
+        ),
+        openapi.Parameter(
+            "page_size",
+            in_=openapi.IN_QUERY,
+            type=openapi.TYPE_INTEGER,
+            description="페이지 크기",
+            required=False,
+        ),
+    ],
     responses={
         200: openapi.Response(
             description="성공",
@@ -50,6 +101,10 @@ supabase: Client = create_client(
                             items=openapi.Schema(type=openapi.TYPE_NUMBER),
                             description="[위도, 경도] 형식의 좌표",
                         ),
+                        "distance": openapi.Schema(
+                            type=openapi.TYPE_NUMBER,
+                            description="near 모드에서 검색 중심까지의 거리 (지도 좌표 단위)",
+                        ),
                     },
                 ),
             ),
@@ -67,52 +122,28 @@ supabase: Client = create_client(
 # @permission_classes([AllowAny])
 def events_list(request):
     try:
-        events = (
-            supabase.table("events").select("*").order("expiry", desc=False).execute()
-        )
+        near = parse_near(request.query_params)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # 만료되지 않은 이벤트만 가져온다
-        events = [
-            event
-            for event in events.data
-            if datetime.fromisoformat(event["expiry"]) > datetime.now()
-        ]
+    try:
+        if near is not None:
+            return _nearby_events(request, near)
 
-        # 해당하는 이벤트의 이미지를 가져온다
-        images = (
-            supabase.table("images")
-            .select("*")
-            .in_("event_id", [event["id"] for event in events])
-            .execute()
+        page_size = get_page_size(
+            request, settings.EVENTS_PAGE_SIZE, settings.EVENTS_PAGE_SIZE_MAX
         )
+        cursor = request.query_params.get("cursor")
 
-        # reconstruct response
-        reconstructed_data = []
-        for event in events:
-            data = {
-                "id": event["id"],
-                "created_at": event["created_at"],
-                "title": event["title"],
-                "host_name": event["host_name"],
-                "destination": event["destination"],
-                "expiry": event["expiry"],
-                "num_started": len(event["started_user_ids"]),
-                "num_completed": len(event["completed_user_ids"]),
-                "remaining_num": event["max_users"]
-                - len(event["started_user_ids"])
-                - len(event["completed_user_ids"]),
-                "coordinates": event["coordinates"],
-            }
-
-            # 이미지 추가
-            for image in images.data:
-                if image["event_id"] == event["id"]:
-                    data["image_url"] = image["url"]
-                    break
-
-            reconstructed_data.append(data)
-
-        return Response(reconstructed_data, status=status.HTTP_200_OK)
+        # 모든 사용자에게 같은 목록이므로 페이지별로 직렬화된 응답을 캐시한다 (common/list_cache.py)
+        body, headers = list_cache.fetch(
+            list_cache.EVENTS,
+            f"{page_size}:{cursor or ''}",
+            functools.partial(_active_events, page_size, cursor),
+        )
+        return list_cache.response(body, headers)
+    except InvalidCursor as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             {"error": f"이벤트 목록 조회 중 오류가 발생했습니다: {str(e)}"},
@@ -120,6 +151,50 @@ def events_list(request):
         )
 
 
+def _active_events(page_size, cursor):
+    # (만료되지 않은 이벤트 한 페이지, 응답 헤더)
+    # 만료되지 않은 이벤트만 (expiry, id) 순으로 가져온다
+    query = active_events_query(supabase, page_size, cursor)
+    events, next_cursor = split_page(query.execute().data, page_size)
+
+    # 해당하는 이벤트의 이미지를 가져온다
+    image_urls = fetch_image_urls(
+        supabase, "event_id", [event["id"] for event in events]
+    )
+
+    # reconstruct response
+    reconstructed_data = [
+        serialize_event_summary(event, image_urls) for event in events
+    ]
+
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return reconstructed_data, headers
+
+
+def _nearby_events(request, near):
+    # near 모드: 반경 안의 만료되지 않은 이벤트를 가까운 순으로 page_size개까지 반환
+    page_size = get_page_size(
+        request, settings.PROXIMITY["PAGE_SIZE"], settings.PROXIMITY["PAGE_SIZE_MAX"]
+    )
+    matches = active_events_index.search(*near, candidate_limit(page_size))
+    if not matches:
+        return Response([], status=status.HTTP_200_OK)
+
+    rows = active_events_by_id_query(supabase, [event_id for event_id, _ in matches])
+    events = order_by_distance(rows.execute().data, matches, page_size)
+
+    image_urls = fetch_image_urls(
+        supabase, "event_id", [event["id"] for event, _ in events]
+    )
+
+    reconstructed_data = [
+        {**serialize_event_summary(event, image_urls), "distance": distance}
+        for event, distance in events
+    ]
+
+    return Response(reconstructed_data, status=status.HTTP_200_OK)
+
+
 @swagger_auto_schema(
     method="POST",
     tags=["events"],
@@ -245,6 +320,7 @@ def events_create(request):
         }
 
         event = supabase.table("events").insert(data).execute().data[0]
+        active_events_index.add(event)
 
         image_file = request.FILES.get("image")
         if image_file:
@@ -267,6 +343,8 @@ def events_create(request):
                 {"id": image_id, "event_id": event["id"], "url": public_url}
             ).execute()
 
+        list_cache.invalidate(list_cache.EVENTS)
+
         return Response(event, status=status.HTTP_201_CREATED)
     except Exception as e:
         return Response(
@@ -317,14 +395,20 @@ def events_detail(request, event_id):
         user_id = request.user.user_id
         # user_id = "6534d0b9-694e-4458-a98f-cfa63f5ae8a6"
 
-        event = (
+        # 이벤트와 이미지는 서로 독립적이므로 동시에 조회
+        event_query = (
             supabase.table("events")
-            .select("*")
+            .select(projections.EVENT_DETAIL)
             .eq("id", event_id)
             .single()
-            .execute()
-            .data
         )
+        images_query = (
+            supabase.table("images")
+            .select(projections.IMAGE_URL)
+            .eq("event_id", event_id)
+        )
+        event, images = gather(event_query.execute, images_query.execute)
+        event = event.data
 
         if not event:
             return Response(
@@ -332,8 +416,6 @@ def events_detail(request, event_id):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        images = supabase.table("images").select("*").eq("event_id", event_id).execute()
-
         # 이미지가 있는 경우에만 URL 설정
         image_url = images.data[0]["url"] if images.data else None
 
@@ -398,27 +480,15 @@ def events_join(request, event_id):
     try:
         user_id = request.user.user_id
         # user_id = "56f9b4f6-327d-4138-b820-2d2cf54a3425"
-        event = (
-            supabase.table("events")
-            .select("*")
-            .eq("id", event_id)
-            .single()
-            .execute()
-            .data
-        )
-
-        # append to started_user_ids
-        event = (
-            supabase.table("events")
-            .update({"started_user_ids": event["started_user_ids"] + [user_id]})
-            .eq("id", event_id)
-            .execute()
-            .data
-        )
+        # append to started_user_ids (정원, 중복 참여 검사 포함)
+        join_event(supabase, event_id, user_id)
+        list_cache.invalidate(list_cache.EVENTS)
 
         return Response(
             {"msg": f"{user_id} joined {event_id}"}, status=status.HTTP_200_OK
         )
+    except APIError as e:
+        return Response({"error": e.message}, status=error_status(e))
     except Exception as e:
         return Response(
             {"error": f"이벤트 참여 중 오류가 발생했습니다: {str(e)}"},
@@ -453,12 +523,13 @@ def events_join(request, event_id):
             ),
         ),
         400: openapi.Response(
-            description="잘못된 답안",
+            description="잘못된 답안 또는 이미 완료한 이벤트",
             schema=openapi.Schema(
                 type=openapi.TYPE_OBJECT,
                 properties={"error": openapi.Schema(type=openapi.TYPE_STRING)},
             ),
         ),
+        404: openapi.Response(description="이벤트 없음"),
     },
 )
 @api_view(["POST"])
@@ -467,57 +538,16 @@ def events_complete(request, event_id):
     try:
         user_id = request.user.user_id
         # user_id = "56f9b4f6-327d-4138-b820-2d2cf54a3425"
-        event = (
-            supabase.table("events")
-            .select("*")
-            .eq("id", event_id)
-            .single()
-            .execute()
-            .data
-        )
-
-        if not event:
-            return Response(
-                {"error": f"Event with id {event_id} not found"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-
-        if request.data["answer_key"] != event["answer_key"]:
-            return Response(
-                {"error": "Incorrect answer key"}, status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # remove user from started_user_ids
-        supabase.table("events").update(
-            {
-                "started_user_ids": [
-                    user_id
-                    for user_id in event["started_user_ids"]
-                    if user_id != user_id
-                ]
-            }
-        ).eq("id", event_id).execute().data
-        # append user to completed_user_ids
-        supabase.table("events").update(
-            {"completed_user_ids": event["completed_user_ids"] + [user_id]}
-        ).eq("id", event_id).execute().data
-
-        # level 업데이트 (기존 user level의 +5)
-        user = (
-            supabase.table("users")
-            .select("*")
-            .eq("user_id", user_id)
-            .single()
-            .execute()
-            .data
-        )
-        supabase.table("users").update(
-            {"level": user["level"] + 5, "num_events": user["num_events"] + 1}
-        ).eq("user_id", user_id).execute().data
+        # 정답 확인, started -> completed 이동, 보상 지급을 한 트랜잭션에서 처리한다
+        complete_event(supabase, event_id, user_id, request.data.get("answer_key"))
+        principal_cache.invalidate(user_id)
+        list_cache.invalidate(list_cache.EVENTS)
 
         return Response(
             {"msg": f"{user_id} completed {event_id}"}, status=status.HTTP_200_OK
         )
+    except APIError as e:
+        return Response({"error": e.message}, status=error_status(e))
     except Exception as e:
         return Response(
             {"error": f"이벤트 완료 중 오류가 발생했습니다: {str(e)}"},
@@ -534,7 +564,7 @@ def events_my(request):
 
         events = (
             supabase.table("events")
-            .select("*")
+            .select(projections.EVENTS_MY)
             .or_(
                 f"started_user_ids.cs.{{{user_id}}},completed_user_ids.cs.{{{user_id}}}"
             )
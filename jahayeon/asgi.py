@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jahayeon.settings")
+# ASGI 서버에서는 I/O 대기 시간이 긴 view를 비동기 버전으로 사용한다 (settings.ASYNC_VIEWS)
+os.environ.setdefault("ASYNC_VIEWS", "true")
 
 application = get_asgi_application()
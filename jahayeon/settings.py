@@ -49,6 +49,7 @@ INSTALLED_APPS = [
     "users",
     "events",
     "parties",
+    "jobs",
     "rest_framework",
     "rest_framework_simplejwt",
     "rest_framework_simplejwt.token_blacklist",
@@ -86,6 +87,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "jahayeon.wsgi.application"
 
+# 목록 조회, AI 응답 생성 view를 비동기 버전(async_views)으로 연결할지 여부
+# 비동기 Supabase/OpenAI 클라이언트는 이벤트 루프에 묶이므로 ASGI 서버(uvicorn)에서만 켠다 (jahayeon/asgi.py)
+ASYNC_VIEWS = env.bool("ASYNC_VIEWS", default=False)
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
@@ -95,10 +100,42 @@ DATABASES = {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
         # 'NAME': '/data/db.sqlite3', # fly.io deploy
+        "OPTIONS": {
+            "timeout": 20,  # 웹 worker와 runjobs worker가 동시에 쓰는 경우 대기
+        },
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/ref/settings/#caches
+# worker, machine 간에 공유하는 캐시 (common/shared_cache.py)
+# REDIS_URL이 있으면 Redis, 없으면 CACHE_DIR의 파일 캐시 (같은 machine의 worker끼리 공유)
+# 캐시에 저장하는 데이터 형식을 바꿀 때는 CACHE_VERSION을 올려 이전 키를 모두 무효화한다
+REDIS_URL = env.str("REDIS_URL", default="")
+CACHE_VERSION = env.int("CACHE_VERSION", default=1)
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "jahayeon",
+            "VERSION": CACHE_VERSION,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "common.shared_cache.CountingFileBasedCache",
+            "LOCATION": env.str("CACHE_DIR", default=str(BASE_DIR / "cache")),
+            # 'LOCATION': '/data/cache', # fly.io deploy
+            "VERSION": CACHE_VERSION,
+            "OPTIONS": {"MAX_ENTRIES": env.int("CACHE_MAX_ENTRIES", default=5000)},
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -158,10 +195,144 @@ SIMPLE_JWT = {
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
 }
 
+# 액세스 토큰에 프로필 claim을 담아 인증 시 DB 조회를 생략하는 모드 (authorize/profile_claims.py)
+# claim 값의 의미가 바뀌면 해당 claim의 버전을 올려 기존 토큰이 DB 조회로 돌아가도록 한다
+JWT_PROFILE_CLAIMS = {
+    "ENABLED": env.bool("JWT_PROFILE_CLAIMS_ENABLED", default=False),
+    "VERSIONS": {
+        "email": 1,
+        "oauth_provider": 1,
+        "full_name": 1,
+    },
+}
+
+# 이벤트 목록 페이지 크기 (기본값, 최대값)
+EVENTS_PAGE_SIZE = env.int("EVENTS_PAGE_SIZE", default=50)
+EVENTS_PAGE_SIZE_MAX = env.int("EVENTS_PAGE_SIZE_MAX", default=100)
+
+# parties_list, events_list의 near=x,y&radius= 모드 설정 (common/proximity.py)
+# 반경(지도 좌표 단위) 기본값/최대값, 결과 수 기본값/최대값, 위치 인덱스 증분/전체 갱신 주기(초)
+PROXIMITY = {
+    "DEFAULT_RADIUS": env.float("PROXIMITY_DEFAULT_RADIUS", default=100.0),
+    "MAX_RADIUS": env.float("PROXIMITY_MAX_RADIUS", default=1000.0),
+    "PAGE_SIZE": env.int("PROXIMITY_PAGE_SIZE", default=50),
+    "PAGE_SIZE_MAX": env.int("PROXIMITY_PAGE_SIZE_MAX", default=100),
+    "REFRESH_INTERVAL": env.int("PROXIMITY_REFRESH_INTERVAL", default=10),
+    "FULL_REFRESH_INTERVAL": env.int("PROXIMITY_FULL_REFRESH_INTERVAL", default=300),
+}
+
+# parties_list, events_list 응답 캐시 (common/list_cache.py, CACHES에 저장), TTL이 0이면 사용하지 않음
+# STALE_WHILE_REVALIDATE를 켜면 TTL이 지난 뒤 STALE_TTL 동안 이전 응답을 반환하며 백그라운드에서 갱신한다
+LIST_CACHE = {
+    "TTL": env.int("LIST_CACHE_TTL", default=5),  # seconds
+    "STALE_WHILE_REVALIDATE": env.bool(
+        "LIST_CACHE_STALE_WHILE_REVALIDATE", default=False
+    ),
+    "STALE_TTL": env.int("LIST_CACHE_STALE_TTL", default=30),  # seconds
+}
+
+# 요청 안에서 독립적인 Supabase 조회를 동시에 실행하는 스레드 수 (common/concurrency.py)
+FANOUT_MAX_WORKERS = env.int("FANOUT_MAX_WORKERS", default=8)
+
+# 파티 종료 사진 프레임 합성 시 해상도별 프레임/알파 마스크 캐시의 최대 크기 (parties/frames.py)
+# 2048px 사진 하나에 약 22MB를 사용하며, 이보다 큰 항목은 캐시하지 않는다 (0이면 캐시하지 않음)
+FRAME_CACHE_MAX_BYTES = env.int("FRAME_CACHE_MAX_BYTES", default=48 * 1024 * 1024)
+
+# 프레임 합성 사진 출력 설정: 긴 변 최대 길이(0이면 원본 유지), 코덱(jpeg/webp/png), 품질(0-100)
+FRAME_OUTPUT = {
+    "MAX_EDGE": env.int("FRAME_OUTPUT_MAX_EDGE", default=2048),
+    "FORMAT": env.str("FRAME_OUTPUT_FORMAT", default="jpeg"),
+    "QUALITY": env.int("FRAME_OUTPUT_QUALITY", default=85),
+}
+
+# 파티 주차 구역 목록 파일([[x, y], ...])과 격자 인덱스 셀 크기(비우면 자동) (parties/parking.py)
+# 파일을 교체하면 다음 파티 생성 시 다시 읽는다
+PARKING_SPOTS = {
+    "PATH": env.str(
+        "PARKING_SPOTS_PATH", default=str(BASE_DIR / "public" / "parking_spots.json")
+    ),
+    "CELL_SIZE": env.float("PARKING_SPOTS_CELL_SIZE", default=0.0),
+}
+
+# 로컬 작업 큐 설정 (jobs/queue.py, python manage.py runjobs)
+JOBS = {
+    "SPOOL_DIR": env.str("JOBS_SPOOL_DIR", default=str(BASE_DIR / "spool")),
+    "MAX_ATTEMPTS": env.int("JOBS_MAX_ATTEMPTS", default=3),
+    "STALE_AFTER": env.int("JOBS_STALE_AFTER", default=600),  # seconds
+}
+
+# CustomJWTAuthentication에서 사용하는 사용자 캐시 (authorize/principal_cache.py, CACHES에 저장)
+# 파일 캐시는 사용자 캐시를 별도 디렉토리(CACHES["principal"])에 두어 목록, AI 캐시와 CACHE_MAX_ENTRIES를
+# 나눠 쓰지 않고 MAXSIZE개로 따로 제한한다 (Redis는 default 캐시를 사용하고 TTL이 지나면 제거된다)
+PRINCIPAL_CACHE = {
+    "MAXSIZE": env.int("PRINCIPAL_CACHE_MAXSIZE", default=1024),
+    "TTL": env.int("PRINCIPAL_CACHE_TTL", default=60),  # seconds
+    "ALIAS": "default" if REDIS_URL else "principal",
+}
+
+if not REDIS_URL:
+    CACHES["principal"] = {
+        **CACHES["default"],
+        "LOCATION": os.path.join(CACHES["default"]["LOCATION"], "principal"),
+        "OPTIONS": {"MAX_ENTRIES": PRINCIPAL_CACHE["MAXSIZE"]},
+    }
+
 SUPABASE_URL = env("SUPABASE_URL")
 SUPABASE_KEY = env("SUPABASE_KEY")
 SUPABASE_SERVICE_ROLE_KEY = env("SUPABASE_SERVICE_ROLE_KEY")
 
+# 공유 Supabase 클라이언트의 HTTP 커넥션 풀 설정 (common/supabase_clients.py)
+SUPABASE_HTTP = {
+    "MAX_CONNECTIONS": env.int("SUPABASE_HTTP_MAX_CONNECTIONS", default=20),
+    "MAX_KEEPALIVE_CONNECTIONS": env.int(
+        "SUPABASE_HTTP_MAX_KEEPALIVE_CONNECTIONS", default=10
+    ),
+    "KEEPALIVE_EXPIRY": env.float("SUPABASE_HTTP_KEEPALIVE_EXPIRY", default=30.0),
+    "HTTP2": env.bool("SUPABASE_HTTP2", default=True),
+    "CONNECT_TIMEOUT": env.float("SUPABASE_HTTP_CONNECT_TIMEOUT", default=5.0),
+    "TIMEOUT": env.float("SUPABASE_HTTP_TIMEOUT", default=10.0),
+    "STORAGE_TIMEOUT": env.float("SUPABASE_HTTP_STORAGE_TIMEOUT", default=30.0),
+}
+
+# gpt_generate, gemini_generate 응답 캐시 (ai/response_cache.py)
+# BACKEND: shared(CACHES, worker/machine 간 공유) | memory(프로세스 단위) | sqlite(DB 공유, 같은 machine의 worker 간 공유)
+#          | 빈 문자열이면 사용하지 않음, MAXSIZE는 memory, sqlite 백엔드에만 적용
+AI_RESPONSE_CACHE = {
+    "BACKEND": env.str("AI_RESPONSE_CACHE_BACKEND", default="shared"),
+    "MAXSIZE": env.int("AI_RESPONSE_CACHE_MAXSIZE", default=512),
+    "TTL": env.int("AI_RESPONSE_CACHE_TTL", default=3600),  # seconds
+}
+
+# 비전 모델에 보내는 이미지 전처리: 긴 변 최대 길이(0이면 원본 유지), JPEG 품질,
+# 요청마다 줄어든 크기를 출력할지 여부 (기본 출력, ai/images.py)
+AI_IMAGE = {
+    "MAX_EDGE": env.int("AI_IMAGE_MAX_EDGE", default=1536),
+    "QUALITY": env.int("AI_IMAGE_QUALITY", default=85),
+    "LOG": env.bool("AI_IMAGE_LOG", default=True),
+}
+
+# 모델 provider 호출 설정 (ai/providers.py)
+# TIMEOUT/CONNECT_TIMEOUT: 초, MAX_RETRIES: 일시적 오류 재시도 횟수, BACKOFF/MAX_BACKOFF: 재시도 대기 초기값/최대값(초)
+AI_PROVIDERS = {
+    "TIMEOUT": env.float("AI_PROVIDER_TIMEOUT", default=60.0),
+    "CONNECT_TIMEOUT": env.float("AI_PROVIDER_CONNECT_TIMEOUT", default=5.0),
+    "MAX_RETRIES": env.int("AI_PROVIDER_MAX_RETRIES", default=2),
+    "BACKOFF": env.float("AI_PROVIDER_BACKOFF", default=0.5),
+    "MAX_BACKOFF": env.float("AI_PROVIDER_MAX_BACKOFF", default=8.0),
+    "MAX_CONNECTIONS": env.int("AI_PROVIDER_MAX_CONNECTIONS", default=20),
+    "MAX_KEEPALIVE_CONNECTIONS": env.int(
+        "AI_PROVIDER_MAX_KEEPALIVE_CONNECTIONS", default=10
+    ),
+}
+
+# gpt_batch 요청당 최대 프롬프트 수, 동시에 생성하는 프롬프트 수 (ai/batch.py),
+# 사용자별 요청 한도 (ai/throttling.py, 예: "10/min")
+AI_BATCH = {
+    "MAX_PROMPTS": env.int("AI_BATCH_MAX_PROMPTS", default=20),
+    "MAX_CONCURRENCY": env.int("AI_BATCH_MAX_CONCURRENCY", default=4),
+    "RATE": env.str("AI_BATCH_RATE", default="10/min"),
+}
+
 OPENAI_API_KEY = env("OPENAI_API_KEY")
 GOOGLE_API_KEY = env("GOOGLE_API_KEY")
 
@@ -177,6 +348,7 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 CORS_ALLOW_CREDENTIALS = True
+CORS_EXPOSE_HEADERS = ["X-Next-Cursor"]
 CORS_ALLOW_HEADERS = [
     "accept",
     "authorization",
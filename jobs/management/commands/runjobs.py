@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs import queue
+
+
+class Command(BaseCommand):
+    help = "큐에 등록된 작업을 처리하는 worker 프로세스를 실행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="대기 중인 작업을 모두 처리한 뒤 종료합니다.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="대기 중인 작업이 없을 때 다시 확인하기까지의 시간(초)",
+        )
+        parser.add_argument(
+            "--requeue-interval",
+            type=float,
+            default=60.0,
+            help="RUNNING 상태로 남은 작업을 다시 큐에 넣는 주기(초)",
+        )
+
+    def requeue_stale(self):
+        requeued = queue.requeue_stale()
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale job(s)")
+
+    def handle(self, *args, **options):
+        # 시작할 때와 실행 중 주기적으로, 다른 worker가 처리하다 멈춘 작업을 다시 큐에 넣는다
+        self.requeue_stale()
+        requeued_at = time.monotonic()
+
+        while True:
+            if time.monotonic() - requeued_at >= options["requeue_interval"]:
+                self.requeue_stale()
+                requeued_at = time.monotonic()
+
+            job = queue.run_next()
+            if job is not None:
+                self.stdout.write(f"{job.kind} {job.id}: {job.status}")
+                continue
+            if options["once"]:
+                return
+            time.sleep(options["poll_interval"])
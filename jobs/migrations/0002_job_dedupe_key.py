@@ -0,0 +1,26 @@
+# Generated by Django 5.1.4 on 2026-10-17 13:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="dedupe_key",
+            field=models.CharField(blank=True, max_length=128, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="job",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("status__in", ["QUEUED", "RUNNING"])),
+                fields=("dedupe_key",),
+                name="unique_active_job_dedupe_key",
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+import uuid
+
+from django.db import models
+
+
+# 웹 요청 밖에서 처리할 작업 (python manage.py runjobs 프로세스가 처리)
+class Job(models.Model):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+    ACTIVE_STATUSES = [QUEUED, RUNNING]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=64)
+    payload = models.JSONField(default=dict)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    status = models.CharField(
+        max_length=16, choices=STATUS_CHOICES, default=QUEUED, db_index=True
+    )
+    user_id = models.CharField(max_length=64, blank=True)
+    # 대기 중이거나 실행 중인 작업 중에서는 같은 값이 하나만 있을 수 있다 (queue.enqueue_once)
+    dedupe_key = models.CharField(max_length=128, null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dedupe_key"],
+                condition=models.Q(status__in=["QUEUED", "RUNNING"]),
+                name="unique_active_job_dedupe_key",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.id} ({self.status})"
@@ -0,0 +1,152 @@
+# SQLite(Django DB) 기반 로컬 작업 큐
+# 웹 요청에서는 enqueue로 작업을 등록하고, runjobs 커맨드 프로세스가 run_next로 하나씩 처리한다
+# 업로드 파일처럼 큰 데이터는 DB 대신 spool 디렉토리에 저장하고 payload에는 경로만 남긴다
+# 실패한 작업은 MAX_ATTEMPTS까지 다시 실행하므로 처리 함수는 재실행되어도 결과가 같도록(idempotent) 작성한다
+import os
+import traceback
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Job
+
+_handlers = {}
+_cleanups = {}
+
+
+def handler(kind, cleanup=None):
+    # @handler("parties.end") 형태로 작업 종류별 처리 함수를 등록한다
+    # 처리 함수는 (payload) -> result(dict)
+    # cleanup(payload)은 작업이 성공하거나 마지막 시도까지 실패해 더 이상 재시도하지 않을 때 호출한다
+    def decorator(func):
+        _handlers[kind] = func
+        if cleanup is not None:
+            _cleanups[kind] = cleanup
+        return func
+
+    return decorator
+
+
+def enqueue(kind, payload, user_id=""):
+    return Job.objects.create(kind=kind, payload=payload, user_id=user_id)
+
+
+def enqueue_once(kind, payload, dedupe_key, user_id=""):
+    """
+    같은 dedupe_key의 작업이 대기 중이거나 실행 중이면 그 작업을, 없으면 새 작업을 등록한다
+    (job, created)를 반환하며, 동시에 요청되어도 DB unique 제약으로 한 작업만 등록된다
+    """
+    # 기존 작업이 조회 직전에 끝났으면 한 번 더 등록을 시도한다
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                job = Job.objects.create(
+                    kind=kind, payload=payload, user_id=user_id, dedupe_key=dedupe_key
+                )
+            return job, True
+        except IntegrityError:
+            job = Job.objects.filter(
+                dedupe_key=dedupe_key, status__in=Job.ACTIVE_STATUSES
+            ).first()
+            if job is not None:
+                return job, False
+    raise IntegrityError(f"Failed to enqueue job {kind} {dedupe_key}")
+
+
+def spool_path():
+    path = Path(settings.JOBS["SPOOL_DIR"])
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def spool_file(uploaded_file):
+    # 업로드 파일을 spool 디렉토리에 저장하고 경로를 반환한다
+    path = spool_path() / f"{uuid.uuid4()}"
+    with open(path, "wb") as spooled:
+        for chunk in uploaded_file.chunks():
+            spooled.write(chunk)
+    return str(path)
+
+
+def remove_spooled(path):
+    # spool 파일을 삭제한다 (이미 없으면 무시)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def claim_next():
+    # QUEUED 상태의 가장 오래된 작업을 RUNNING으로 바꾸며 가져온다
+    # 여러 worker가 동시에 실행되어도 update 결과로 한 worker만 가져가도록 한다
+    for job in Job.objects.filter(status=Job.QUEUED).order_by("created_at")[:10]:
+        claimed = Job.objects.filter(id=job.id, status=Job.QUEUED).update(
+            status=Job.RUNNING, started_at=timezone.now(), attempts=job.attempts + 1
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def run(job):
+    func = _handlers.get(job.kind)
+    try:
+        if func is None:
+            raise LookupError(f"No handler registered for job kind {job.kind}")
+        job.result = func(job.payload)
+        job.status = Job.SUCCEEDED
+        job.error = ""
+    except Exception:
+        job.error = traceback.format_exc()
+        if func is not None and job.attempts < settings.JOBS["MAX_ATTEMPTS"]:
+            job.status = Job.QUEUED
+        else:
+            job.status = Job.FAILED
+    job.finished_at = timezone.now()
+    job.save(update_fields=["result", "status", "error", "finished_at"])
+
+    if job.status != Job.QUEUED:
+        _cleanup(job)
+    return job
+
+
+def _cleanup(job):
+    cleanup = _cleanups.get(job.kind)
+    if cleanup is None:
+        return
+    try:
+        cleanup(job.payload)
+    except Exception as e:
+        print(f"Job cleanup failed for {job.kind} {job.id}: {e}")
+
+
+def run_next():
+    # 처리한 작업이 있으면 그 작업을, 없으면 None을 반환
+    job = claim_next()
+    if job is None:
+        return None
+    return run(job)
+
+
+def requeue_stale():
+    # worker가 비정상 종료되어 RUNNING 상태로 남은 작업을 다시 큐에 넣고, 다시 넣은 작업 수를 반환한다
+    # 이미 MAX_ATTEMPTS만큼 시도한 작업은 (같은 작업이 worker를 반복해서 종료시키지 않도록) 실패 처리한다
+    stale_before = timezone.now() - timedelta(seconds=settings.JOBS["STALE_AFTER"])
+    stale = Job.objects.filter(status=Job.RUNNING, started_at__lt=stale_before)
+    requeued = stale.filter(attempts__lt=settings.JOBS["MAX_ATTEMPTS"]).update(
+        status=Job.QUEUED
+    )
+    for job in stale:
+        updated = Job.objects.filter(id=job.id, status=Job.RUNNING).update(
+            status=Job.FAILED,
+            error="Worker stopped while running the job",
+            finished_at=timezone.now(),
+        )
+        if updated:
+            _cleanup(job)
+    return requeued
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import queue
+from .models import Job
+
+KIND = "tests.job"
+
+calls = {"run": 0, "cleanup": []}
+
+
+@queue.handler(KIND, cleanup=lambda payload: calls["cleanup"].append(payload))
+def failing_job(payload):
+    calls["run"] += 1
+    if payload.get("fail"):
+        raise RuntimeError("boom")
+    return {"ok": True}
+
+
+@override_settings(JOBS={"SPOOL_DIR": "", "MAX_ATTEMPTS": 2, "STALE_AFTER": 600})
+class QueueTests(TestCase):
+    def setUp(self):
+        calls["run"], calls["cleanup"] = 0, []
+
+    def test_enqueue_once_returns_active_job(self):
+        job, created = queue.enqueue_once(KIND, {}, dedupe_key="party:1")
+        again, created_again = queue.enqueue_once(KIND, {}, dedupe_key="party:1")
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(job.id, again.id)
+
+        queue.run_next()
+        _, created = queue.enqueue_once(KIND, {}, dedupe_key="party:1")
+        self.assertTrue(created)
+
+    def test_cleanup_runs_once_after_final_attempt(self):
+        job = queue.enqueue(KIND, {"fail": True})
+
+        queue.run_next()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(calls["cleanup"], [])
+
+        queue.run_next()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(calls["cleanup"], [{"fail": True}])
+        self.assertEqual(calls["run"], 2)
+
+    def test_cleanup_runs_on_success(self):
+        queue.enqueue(KIND, {"id": 1})
+        self.assertEqual(queue.run_next().status, Job.SUCCEEDED)
+        self.assertEqual(calls["cleanup"], [{"id": 1}])
+
+    def test_requeue_stale(self):
+        started_at = timezone.now() - timedelta(seconds=601)
+        retry = queue.enqueue(KIND, {"id": 1})
+        last = queue.enqueue(KIND, {"id": 2})
+        Job.objects.filter(id=retry.id).update(
+            status=Job.RUNNING, started_at=started_at, attempts=1
+        )
+        Job.objects.filter(id=last.id).update(
+            status=Job.RUNNING, started_at=started_at, attempts=2
+        )
+
+        self.assertEqual(queue.requeue_stale(), 1)
+        retry.refresh_from_db()
+        last.refresh_from_db()
+        self.assertEqual(retry.status, Job.QUEUED)
+        self.assertEqual(last.status, Job.FAILED)
+        self.assertEqual(calls["cleanup"], [{"id": 2}])
@@ -0,0 +1,59 @@
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+
+from .models import Job
+
+
+@swagger_auto_schema(
+    method="GET",
+    tags=["jobs"],
+    operation_summary="작업 상태 조회",
+    operation_description="비동기로 처리되는 작업의 상태와 결과를 조회합니다.",
+    responses={
+        200: openapi.Response(
+            description="성공",
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "id": openapi.Schema(type=openapi.TYPE_STRING),
+                    "status": openapi.Schema(
+                        type=openapi.TYPE_STRING,
+                        description="QUEUED, RUNNING, SUCCEEDED, FAILED",
+                    ),
+                    "result": openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        description="작업 결과 (SUCCEEDED인 경우)",
+                    ),
+                    "error": openapi.Schema(
+                        type=openapi.TYPE_STRING,
+                        description="마지막 시도의 오류 (FAILED인 경우)",
+                    ),
+                },
+            ),
+        ),
+        404: openapi.Response(description="작업을 찾을 수 없음"),
+    },
+)
+@api_view(["GET"])
+def job_status(request, job_id):
+    job = Job.objects.filter(id=job_id, user_id=request.user.user_id).first()
+    if job is None:
+        return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    # 저장된 traceback 중 마지막 줄(예외 종류와 메시지)만 반환한다
+    error = None
+    if job.status == Job.FAILED and job.error:
+        error = job.error.strip().splitlines()[-1]
+
+    return Response(
+        {
+            "id": str(job.id),
+            "status": job.status,
+            "result": job.result if job.status == Job.SUCCEEDED else None,
+            "error": error,
+        },
+        status=status.HTTP_200_OK,
+    )
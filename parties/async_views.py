@@ -0,0 +1,85 @@
+# ASGI 모드(settings.ASYNC_VIEWS)에서 사용하는 parties 비동기 view
+# 쿼리와 직렬화는 views와 같은 함수(queries.py)를 사용하고, 요청만 비동기 Supabase 클라이언트로 보낸다
+import functools
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.views.decorators.http import require_GET
+
+from authorize.async_authentication import authenticated
+from common import list_cache
+from common.async_http import json_response
+from common.listing import afetch_image_urls
+from common.pagination import get_page_size
+from common.proximity import candidate_limit, order_by_distance, parse_near
+from common.supabase_clients import aget_service_client
+
+from .queries import (
+    open_parties_by_id_query,
+    open_parties_index,
+    open_parties_query,
+    serialize_party_summary,
+)
+
+
+@require_GET
+@authenticated
+async def parties_list(request):
+    try:
+        near = parse_near(request.GET)
+    except ValueError as e:
+        return json_response({"error": str(e)}, status=400)
+
+    try:
+        supabase = await aget_service_client()
+        if near is not None:
+            return await _nearby_parties(supabase, request, near)
+
+        body, headers = await list_cache.afetch(
+            list_cache.PARTIES, "", functools.partial(_open_parties, supabase)
+        )
+        return list_cache.response(body, headers)
+    except Exception as e:
+        return json_response({"error": str(e)}, status=400)
+
+
+async def _open_parties(supabase):
+    # views._open_parties의 비동기 버전
+    parties = (await open_parties_query(supabase).execute()).data
+
+    if not parties:
+        return [], None
+
+    # 해당하는 parties의 이미지 조회
+    image_urls = await afetch_image_urls(
+        supabase, "party_id", [party["id"] for party in parties]
+    )
+
+    return [serialize_party_summary(party, image_urls) for party in parties], None
+
+
+async def _nearby_parties(supabase, request, near):
+    # views._nearby_parties의 비동기 버전
+    # 인덱스 갱신은 동기 클라이언트를 사용하므로 스레드에서 실행한다
+    page_size = get_page_size(
+        request, settings.PROXIMITY["PAGE_SIZE"], settings.PROXIMITY["PAGE_SIZE_MAX"]
+    )
+    matches = await sync_to_async(open_parties_index.search, thread_sensitive=False)(
+        *near, candidate_limit(page_size)
+    )
+    if not matches:
+        return json_response([])
+
+    rows = open_parties_by_id_query(supabase, [party_id for party_id, _ in matches])
+    parties = order_by_distance((await rows.execute()).data, matches, page_size)
+
+    image_urls = await afetch_image_urls(
+        supabase, "party_id", [party["id"] for party, _ in parties]
+    )
+
+    return json_response(
+        [
+            {**serialize_party_summary(party, image_urls), "distance": distance}
+            for party, distance in parties
+        ]
+    )
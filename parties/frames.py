@@ -0,0 +1,155 @@
+# 파티 종료 사진에 지쿠 프레임을 합성하는 함수
+# 프레임 PNG는 프로세스당 한 번만 디코딩하고,
+# 사진 해상도별로 리사이즈한 프레임과 알파 마스크를 LRU 캐시에 보관한다
+# 캐시는 항목 수가 아닌 바이트(FRAME_CACHE_MAX_BYTES)로 제한하고, 한도보다 큰 항목은 캐시하지 않는다
+# 합성은 uint16 고정소수점으로 행 stripe 단위로 원본 배열에 직접 수행한다
+import functools
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from django.conf import settings
+
+from common.imaging import downscale, encode
+
+FRAME_PATH = settings.BASE_DIR / "public" / "gcoo_frame.png"
+
+# 합성 시 한 번에 처리하는 행 수, 임시 배열 크기가 이 stripe 단위로 제한된다
+STRIPE_ROWS = 64
+
+_cache_lock = threading.Lock()
+_cache = OrderedDict()  # (width, height) -> (segments, nbytes)
+_cache_bytes = 0
+
+
+@functools.lru_cache(maxsize=1)
+def load_overlay():
+    overlay = cv2.imread(str(FRAME_PATH), cv2.IMREAD_UNCHANGED)
+    if overlay is None:
+        raise FileNotFoundError(f"Frame overlay not found: {FRAME_PATH}")
+    overlay.setflags(write=False)
+    return overlay
+
+
+def overlay_for_size(width, height):
+    """
+    Returns blend segments for the overlay resized to width x height
+
+    Results are kept in an LRU cache bounded by settings.FRAME_CACHE_MAX_BYTES.
+
+    The frame is split into stripes of STRIPE_ROWS rows, and each stripe into
+    column runs where alpha is non-zero. Fully transparent areas are skipped.
+    Each segment is (row_start, row_end, col_start, col_end, premultiplied, inverse_alpha)
+    premultiplied: uint16 (h, w, 3), foreground * alpha
+    inverse_alpha: uint8 (h, w, 1), 255 - alpha
+    """
+    global _cache_bytes
+
+    key = (width, height)
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+            return entry[0]
+
+    segments = _build_segments(width, height)
+    nbytes = sum(
+        premultiplied.nbytes + inverse_alpha.nbytes
+        for *_, premultiplied, inverse_alpha in segments
+    )
+    limit = getattr(settings, "FRAME_CACHE_MAX_BYTES", 0)
+    if nbytes > limit:
+        return segments
+
+    with _cache_lock:
+        if key not in _cache:
+            _cache[key] = (segments, nbytes)
+            _cache_bytes += nbytes
+        while _cache_bytes > limit:
+            _, (_, evicted) = _cache.popitem(last=False)
+            _cache_bytes -= evicted
+    return segments
+
+
+def _build_segments(width, height):
+    overlay_resized = cv2.resize(load_overlay(), (width, height))
+    alpha = overlay_resized[:, :, 3]
+
+    segments = []
+    for row_start in range(0, height, STRIPE_ROWS):
+        row_end = min(row_start + STRIPE_ROWS, height)
+        for col_start, col_end in _nonzero_runs(alpha[row_start:row_end].any(axis=0)):
+            stripe = overlay_resized[row_start:row_end, col_start:col_end]
+            stripe_alpha = stripe[:, :, 3:4]
+            premultiplied = stripe[:, :, :3].astype(np.uint16) * stripe_alpha
+            inverse_alpha = 255 - stripe_alpha
+
+            premultiplied.setflags(write=False)
+            inverse_alpha.setflags(write=False)
+            segments.append(
+                (row_start, row_end, col_start, col_end, premultiplied, inverse_alpha)
+            )
+    return tuple(segments)
+
+
+def _nonzero_runs(mask):
+    # [False, True, True, False, True] -> [(1, 3), (4, 5)]
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.view(np.int8), [0]))))
+    return zip(edges[::2].tolist(), edges[1::2].tolist())
+
+
+def composite(background, segments):
+    """
+    Blends overlay segments into background (uint8 BGR) in place
+
+    background * (1 - alpha) + foreground * alpha is computed in uint16 fixed point
+    per segment, so temporaries never exceed one stripe.
+    """
+    for segment in segments:
+        row_start, row_end, col_start, col_end, premultiplied, inverse_alpha = segment
+        target = background[row_start:row_end, col_start:col_end]
+
+        blended = target.astype(np.uint16)
+        blended *= inverse_alpha
+        blended += premultiplied
+        # round(x / 255) for 0 <= x <= 255 * 255
+        blended += 128
+        blended += blended >> 8
+        blended >>= 8
+
+        target[...] = blended
+    return background
+
+
+def apply_frame(
+    uploaded_image,
+):
+    """
+    Places overlay image on top of the background image, respecting transparency
+
+    Parameters:
+    uploaded_image: Django UploadedFile from request.FILES
+
+    Returns (image_bytes, file_extension, content_type) encoded as settings.FRAME_OUTPUT
+    """
+    output = settings.FRAME_OUTPUT
+
+    # Convert Django uploaded file to numpy array
+    image_bytes = uploaded_image.read()
+    uploaded_image.seek(0)
+    nparr = np.frombuffer(image_bytes, np.uint8)
+    background = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    if background is None:
+        raise ValueError("Uploaded file is not a valid image")
+
+    # Bound the resolution before compositing
+    background = downscale(background, output["MAX_EDGE"])
+
+    # Resized overlay segments are cached per resolution
+    segments = overlay_for_size(background.shape[1], background.shape[0])
+
+    # Combine images in place
+    result = composite(background, segments)
+
+    return encode(result, output["FORMAT"], output["QUALITY"])
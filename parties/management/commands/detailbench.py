@@ -0,0 +1,172 @@
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+from common.supabase_clients import PooledClient
+from parties.queries import fetch_party_detail
+
+
+def baseline_party_detail(client, party_id):
+    # 기존 parties_detail의 순차 조회 4번 (파티, 주최자, 참가자, 이미지)
+    party = client.table("parties").select("*").eq("id", party_id).execute().data[0]
+    organizer = (
+        client.table("users")
+        .select("nickname")
+        .eq("user_id", party["organizer_id"])
+        .execute()
+        .data
+    )
+    participants = []
+    if party["participant_ids"]:
+        participants = (
+            client.table("users")
+            .select("user_id, nickname")
+            .in_("user_id", party["participant_ids"])
+            .execute()
+            .data
+        )
+    images = client.table("images").select("*").eq("party_id", party["id"]).execute()
+    return {
+        "party": party,
+        "organizer": organizer[0] if organizer else None,
+        "participants": participants,
+        "image_url": images.data[0]["url"] if images.data else None,
+    }
+
+
+class StandIn:
+    """
+    parties_detail이 사용하는 PostgREST 엔드포인트만 흉내 내는 로컬 서버
+
+    요청마다 latency초를 기다린 뒤 응답하여 Supabase까지의 왕복 시간을 재현한다.
+    """
+
+    def __init__(self, latency, participants):
+        self.users = {
+            f"user-{i}": {"user_id": f"user-{i}", "nickname": f"닉네임{i}"}
+            for i in range(participants + 1)
+        }
+        self.party = {
+            "id": 1,
+            "title": "파티",
+            "organizer_id": "user-0",
+            "participant_ids": [f"user-{i}" for i in range(1, participants + 1)],
+            "omw_ids": [],
+            "finished_ids": [],
+            "state": 0,
+        }
+        self.image = {"id": "image", "party_id": 1, "url": "http://image"}
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # 헤더와 body를 따로 쓰므로 Nagle 지연이 측정에 섞이지 않도록 끈다
+            disable_nagle_algorithm = True
+
+            def _reply(self, data):
+                # postgrest 클라이언트는 GET에도 body를 보내므로 keep-alive 연결을 위해 읽어 둔다
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                time.sleep(latency)
+                body = json.dumps(data, ensure_ascii=False).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urllib.parse.urlparse(self.path)
+                params = {k: v[0] for k, v in urllib.parse.parse_qs(url.query).items()}
+                self._reply(standin.select(url.path.rsplit("/", 1)[-1], params))
+
+            def do_POST(self):
+                self._reply(standin.detail())
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def select(self, table, params):
+        if table == "parties":
+            return [self.party]
+        if table == "images":
+            return [self.image]
+        condition = params.get("user_id", "")
+        if condition.startswith("eq."):
+            ids = [condition[3:]]
+        else:
+            ids = condition[4:-1].split(",")
+        return [self.users[user_id] for user_id in ids if user_id in self.users]
+
+    def detail(self):
+        return {
+            "party": self.party,
+            "organizer": {"nickname": self.users["user-0"]["nickname"]},
+            "participants": [
+                self.users[user_id] for user_id in self.party["participant_ids"]
+            ],
+            "image_url": self.image["url"],
+        }
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class Command(BaseCommand):
+    help = (
+        "로컬 PostgREST stand-in에서 parties_detail의 기존 순차 조회 4번과 "
+        "party_detail RPC 1번의 지연 시간을 비교합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--latency", type=float, default=20, help="stand-in 요청당 지연 (ms)"
+        )
+        parser.add_argument("--participants", type=int, default=8, help="참가자 수")
+        parser.add_argument("--requests", type=int, default=50, help="조회 횟수")
+
+    def handle(self, *args, **options):
+        with StandIn(options["latency"] / 1000, options["participants"]) as standin:
+            client = PooledClient.create(standin.url, "stand.in.key")
+            count = options["requests"]
+
+            # 커넥션을 미리 맺어 두어 첫 요청의 연결 시간이 결과에 섞이지 않도록 한다
+            baseline_party_detail(client, 1)
+            fetch_party_detail(client, 1)
+
+            started = time.perf_counter()
+            for _ in range(count):
+                expected = baseline_party_detail(client, 1)
+            baseline = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for _ in range(count):
+                actual = fetch_party_detail(client, 1)
+            rpc = time.perf_counter() - started
+
+        same = (
+            actual["organizer"]["nickname"] == expected["organizer"]["nickname"]
+            and actual["participants"] == expected["participants"]
+            and actual["image_url"] == expected["image_url"]
+        )
+        per_request = 1e3 / count
+        self.stdout.write(
+            f"latency={options['latency']:g}ms participants={options['participants']} "
+            f"requests={count}"
+        )
+        self.stdout.write(
+            f"baseline (4 queries): {baseline * per_request:.1f}ms/request"
+        )
+        self.stdout.write(f"party_detail RPC:     {rpc * per_request:.1f}ms/request")
+        self.stdout.write(f"speedup: {baseline / rpc:.1f}x, same result: {same}")
@@ -0,0 +1,83 @@
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from parties import frames
+
+
+def float_composite(background, overlay):
+    # 기존 apply_frame의 float64 합성 (리사이즈, 3채널 알파 스택, 전체 이미지 연산)
+    overlay_resized = cv2.resize(overlay, (background.shape[1], background.shape[0]))
+    alpha_channel = overlay_resized[:, :, 3] / 255.0
+    alpha_3_channel = np.stack([alpha_channel, alpha_channel, alpha_channel], axis=2)
+    foreground = overlay_resized[:, :, :3]
+    return background * (1 - alpha_3_channel) + foreground * alpha_3_channel
+
+
+def measure(function, *args):
+    # (결과, 초, numpy 할당을 포함한 최대 추가 메모리 bytes)
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+class Command(BaseCommand):
+    help = "사진 크기별로 기존 float64 프레임 합성과 uint16 고정소수점 stripe 합성의 시간과 최대 메모리를 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            default=["1280x960", "2048x1536", "3024x4032", "4000x3000"],
+            help="가로x세로 목록",
+        )
+        parser.add_argument("--repeat", type=int, default=3, help="크기별 반복 횟수")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options["seed"])
+        overlay = frames.load_overlay()
+        repeat = options["repeat"]
+
+        self.stdout.write(
+            f"{'size':>10} {'float64 ms':>11} {'peak MB':>8} "
+            f"{'segments ms':>12} {'fixed ms':>9} {'peak MB':>8} {'max diff':>9}"
+        )
+        for size in options["sizes"]:
+            width, height = (int(value) for value in size.split("x"))
+            background = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+            baseline_time, baseline_peak = 0.0, 0
+            for _ in range(repeat):
+                expected, elapsed, peak = measure(float_composite, background, overlay)
+                baseline_time += elapsed
+                baseline_peak = max(baseline_peak, peak)
+            expected = np.clip(np.rint(expected), 0, 255).astype(np.uint8)
+
+            # 해상도별 세그먼트는 캐시되므로 첫 생성 시간만 따로 보고한다
+            segments, build_time, _ = measure(frames._build_segments, width, height)
+
+            fixed_time, fixed_peak = 0.0, 0
+            for _ in range(repeat):
+                # 합성은 원본 배열에 직접 쓰므로 복사본을 사용한다 (복사는 측정에서 제외)
+                target = background.copy()
+                actual, elapsed, peak = measure(frames.composite, target, segments)
+                fixed_time += elapsed
+                fixed_peak = max(fixed_peak, peak)
+
+            difference = int(
+                np.abs(actual.astype(np.int16) - expected.astype(np.int16)).max()
+            )
+            self.stdout.write(
+                f"{size:>10} {baseline_time / repeat * 1e3:>11.1f} "
+                f"{baseline_peak / 2**20:>8.1f} {build_time * 1e3:>12.1f} "
+                f"{fixed_time / repeat * 1e3:>9.1f} {fixed_peak / 2**20:>8.1f} "
+                f"{difference:>9}"
+            )
@@ -0,0 +1,86 @@
+import math
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from common import geo
+
+
+def python_nearest(rows, x, y, k, radius):
+    # 행마다 파이썬으로 거리를 계산하고 전체를 정렬하는 기준 구현
+    matches = []
+    for index, row in enumerate(rows):
+        row_x, row_y = row["coordinates"]
+        distance = math.hypot(row_x - x, row_y - y)
+        if distance <= radius:
+            matches.append((distance, index))
+    return [index for _, index in sorted(matches)[:k]]
+
+
+class Command(BaseCommand):
+    help = "common.geo의 벡터화된 평면 거리 계산과 파이썬 반복문의 반경 내 top-k 조회 시간을 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--points", type=int, default=100000, help="임의로 만들 좌표 수"
+        )
+        parser.add_argument("--queries", type=int, default=100, help="조회 횟수")
+        parser.add_argument(
+            "--extent", type=float, default=4000, help="지도 한 변의 길이 (좌표 단위)"
+        )
+        parser.add_argument(
+            "--radius", type=float, default=100, help="반경 (좌표 단위)"
+        )
+        parser.add_argument("--k", type=int, default=50, help="조회당 최대 결과 수")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options["seed"])
+        count, radius, k = options["points"], options["radius"], options["k"]
+        extent = options["extent"]
+
+        rows = [
+            {"id": index, "coordinates": coordinates}
+            for index, coordinates in enumerate(
+                rng.uniform(0, extent, (count, 2)).tolist()
+            )
+        ]
+        queries = rng.uniform(0, extent, (options["queries"], 2)).tolist()
+
+        started = time.perf_counter()
+        xs, ys = geo.coordinate_arrays(rows)
+        convert = time.perf_counter() - started
+
+        started = time.perf_counter()
+        expected = [python_nearest(rows, x, y, k, radius) for x, y in queries]
+        python = time.perf_counter() - started
+
+        started = time.perf_counter()
+        # 반경 조건 없이 전체 점의 거리를 계산하는 경우
+        for x, y in queries:
+            geo.top_k(geo.euclidean(x, y, xs, ys), k)
+        full_scan = time.perf_counter() - started
+
+        started = time.perf_counter()
+        actual = [
+            geo.planar_nearest(x, y, xs, ys, k=k, radius=radius)[0].tolist()
+            for x, y in queries
+        ]
+        prefiltered = time.perf_counter() - started
+
+        mismatches = sum(a != b for a, b in zip(actual, expected))
+        matched = sum(len(result) for result in actual) / len(queries)
+        per_query = 1e3 / len(queries)
+        self.stdout.write(
+            f"points={count} queries={len(queries)} extent={extent:g} "
+            f"radius={radius:g} k={k} matches/query={matched:.1f} "
+            f"coordinate_arrays={convert * 1e3:.1f}ms"
+        )
+        self.stdout.write(f"python loop:          {python * per_query:.2f}ms/query")
+        self.stdout.write(f"euclidean + top_k:    {full_scan * per_query:.2f}ms/query")
+        self.stdout.write(
+            f"square + euclidean:   {prefiltered * per_query:.2f}ms/query "
+            f"({python / prefiltered:.0f}x)"
+        )
+        self.stdout.write(f"mismatches: {mismatches}")
@@ -0,0 +1,98 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from postgrest.exceptions import APIError
+
+from common.supabase_clients import get_service_client
+from parties.queries import join_party
+
+
+class Command(BaseCommand):
+    help = (
+        "모집 중인 테스트 파티에 임의의 사용자 id로 party_join RPC를 동시에 호출하여 "
+        "참가 내역 유실, 정원 초과, 중복 참가가 없는지 확인합니다. "
+        "SUPABASE_URL이 가리키는 DB의 파티를 수정하므로 테스트용 파티에만 사용하세요."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("party_id", type=int, help="테스트할 모집 중인 파티 id")
+        parser.add_argument(
+            "--users", type=int, default=50, help="동시에 참가할 사용자 수"
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="확인 후 participant_ids를 되돌리지 않음",
+        )
+
+    def handle(self, *args, **options):
+        client = get_service_client()
+        party_id = options["party_id"]
+        party = (
+            client.table("parties")
+            .select("participant_ids, max_users, state")
+            .eq("id", party_id)
+            .execute()
+            .data
+        )
+        if not party:
+            raise CommandError(f"Party {party_id} not found")
+        party = party[0]
+        before = party["participant_ids"] or []
+
+        user_ids = [str(uuid.uuid4()) for _ in range(options["users"])]
+        # 같은 사용자가 두 번 참가하는 경우도 섞는다
+        attempts = user_ids + user_ids[:5]
+
+        def join(user_id):
+            try:
+                join_party(client, party_id, user_id)
+                return user_id, None
+            except APIError as e:
+                return user_id, e.message
+
+        with ThreadPoolExecutor(max_workers=len(attempts)) as pool:
+            results = list(pool.map(join, attempts))
+
+        after = (
+            client.table("parties")
+            .select("participant_ids")
+            .eq("id", party_id)
+            .execute()
+            .data[0]["participant_ids"]
+            or []
+        )
+        joined = [user_id for user_id, error in results if error is None]
+        errors = {}
+        for _, error in results:
+            if error is not None:
+                errors[error] = errors.get(error, 0) + 1
+
+        added = [str(user_id) for user_id in after[len(before) :]]
+        lost = set(joined) - set(added)
+        capacity = max(party["max_users"] - len(before), 0)
+        failures = []
+        if lost:
+            failures.append(
+                f"{len(lost)} successful joins missing from participant_ids"
+            )
+        if len(added) != len(set(added)):
+            failures.append("duplicate participants")
+        if len(added) > capacity:
+            failures.append(f"{len(added)} joined over remaining capacity {capacity}")
+        if party["state"] == 0 and len(added) < min(capacity, len(user_ids)):
+            failures.append(f"only {len(added)} joined with capacity {capacity}")
+
+        if not options["keep"]:
+            client.table("parties").update({"participant_ids": before}).eq(
+                "id", party_id
+            ).execute()
+
+        self.stdout.write(
+            f"attempts={len(attempts)} joined={len(joined)} capacity={capacity} "
+            f"errors={errors}"
+        )
+        if failures:
+            raise CommandError("; ".join(failures))
+        self.stdout.write("OK: no lost updates, duplicates or overbooking")
@@ -0,0 +1,70 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from common.listing import attach_image_url, index_image_urls
+
+
+def nested_loop(parties, images):
+    # 기존 목록 view의 방식: 행마다 images 전체를 처음부터 순회한다
+    result = []
+    for party in parties:
+        data = {"id": party["id"], "title": party["title"]}
+        for image in images:
+            if image["party_id"] == party["id"]:
+                data["image_url"] = image["url"]
+                break
+        result.append(data)
+    return result
+
+
+def indexed(parties, images):
+    image_urls = index_image_urls(images, "party_id")
+    return [
+        attach_image_url(
+            {"id": party["id"], "title": party["title"]}, image_urls, party["id"]
+        )
+        for party in parties
+    ]
+
+
+class Command(BaseCommand):
+    help = "목록 응답에 이미지 URL을 붙일 때 행마다 images를 순회하는 방식과 common.listing의 인덱스 방식을 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--parties", type=int, default=10000, help="파티 수")
+        parser.add_argument("--images", type=int, default=30000, help="이미지 수")
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="인덱스 방식 반복 횟수"
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        count = options["parties"]
+
+        parties = [{"id": index, "title": f"파티{index}"} for index in range(count)]
+        # 이미지가 없는 파티도 섞이도록 파티 id 범위를 조금 넓혀 임의로 배정한다
+        images = [
+            {"url": f"http://image/{index}", "party_id": rng.randrange(count * 5 // 4)}
+            for index in range(options["images"])
+        ]
+        rng.shuffle(images)
+
+        started = time.perf_counter()
+        expected = nested_loop(parties, images)
+        baseline = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(options["repeat"]):
+            actual = indexed(parties, images)
+        index = (time.perf_counter() - started) / options["repeat"]
+
+        with_image = sum("image_url" in data for data in actual)
+        self.stdout.write(
+            f"parties={count} images={len(images)} parties with image={with_image}"
+        )
+        self.stdout.write(f"nested loop: {baseline * 1e3:.1f}ms")
+        self.stdout.write(f"index:       {index * 1e3:.1f}ms ({baseline / index:.0f}x)")
+        self.stdout.write(f"same result: {actual == expected}")
@@ -0,0 +1,98 @@
+import asyncio
+import statistics
+import time
+
+import httpx
+from django.core.management.base import BaseCommand
+
+
+async def unloaded_latency(url, headers, count, timeout):
+    # 다른 요청 없이 순서대로 보낸 요청의 지연 시간 중앙값 (서버에서 요청 하나가 머무는 시간)
+    latencies = []
+    async with httpx.AsyncClient(headers=headers, timeout=timeout) as client:
+        for _ in range(count):
+            started = time.perf_counter()
+            await client.get(url)
+            latencies.append(time.perf_counter() - started)
+    return statistics.median(latencies)
+
+
+async def run_load(url, headers, concurrency, count, timeout):
+    # concurrency개의 요청을 동시에 유지하며 count번 요청한다
+    # (상태 코드별 횟수, 요청별 지연 시간 목록, 전체 시간)
+    statuses, latencies = {}, []
+    remaining = iter(range(count))
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+
+    async with httpx.AsyncClient(
+        headers=headers, limits=limits, timeout=timeout
+    ) as client:
+
+        async def worker():
+            for _ in remaining:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    key = response.status_code
+                except httpx.HTTPError as e:
+                    key = type(e).__name__
+                latencies.append(time.perf_counter() - started)
+                statuses[key] = statuses.get(key, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return statuses, latencies, elapsed
+
+
+class Command(BaseCommand):
+    help = (
+        "실행 중인 서버의 GET 엔드포인트에 동시 요청을 보내 처리량을 측정합니다. "
+        "처리량 x 부하가 없을 때의 지연 시간으로 서버가 동시에 처리한 요청 수를 추정하여 worker 수와 비교합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", help="요청할 URL")
+        parser.add_argument("--concurrency", type=int, default=50, help="동시 요청 수")
+        parser.add_argument("--requests", type=int, default=500, help="전체 요청 수")
+        parser.add_argument(
+            "--warmup", type=int, default=5, help="부하 전 순차 요청 수"
+        )
+        parser.add_argument("--token", help="Authorization Bearer 토큰")
+        parser.add_argument(
+            "--timeout", type=float, default=30.0, help="요청 timeout (초)"
+        )
+
+    def handle(self, *args, **options):
+        headers = {}
+        if options["token"]:
+            headers["Authorization"] = f"Bearer {options['token']}"
+
+        url, timeout = options["url"], options["timeout"]
+        unloaded = asyncio.run(
+            unloaded_latency(url, headers, max(options["warmup"], 1), timeout)
+        )
+        statuses, latencies, elapsed = asyncio.run(
+            run_load(url, headers, options["concurrency"], options["requests"], timeout)
+        )
+
+        throughput = len(latencies) / elapsed
+        ordered = sorted(latencies)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        self.stdout.write(
+            f"requests={len(latencies)} concurrency={options['concurrency']} "
+            f"elapsed={elapsed:.2f}s statuses={statuses}"
+        )
+        self.stdout.write(
+            f"throughput: {throughput:.1f} req/s, latency min/median/p95: "
+            f"{ordered[0] * 1e3:.0f}/{statistics.median(ordered) * 1e3:.0f}/"
+            f"{p95 * 1e3:.0f}ms"
+        )
+        # 요청 하나가 부하가 없을 때의 지연 시간만큼 서버에서 처리된다고 보면 (Little's law)
+        # 서버가 동시에 처리한 요청 수는 평균 처리량 x 지연 시간이다
+        self.stdout.write(
+            f"unloaded latency: {unloaded * 1e3:.0f}ms, "
+            f"estimated requests in flight on the server: {throughput * unloaded:.1f}"
+        )
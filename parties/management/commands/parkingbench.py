@@ -0,0 +1,53 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from parties.parking import ParkingSpotIndex
+
+
+def linear_nearest(spots, coordinates):
+    # 기존 parties_create의 선형 탐색
+    return min(
+        spots,
+        key=lambda spot: (spot[0] - coordinates[0]) ** 2
+        + (spot[1] - coordinates[1]) ** 2,
+    )
+
+
+class Command(BaseCommand):
+    help = "주차 구역 격자 인덱스와 선형 탐색의 가장 가까운 주차 구역 조회 시간을 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--spots", type=int, default=50000, help="임의로 만들 주차 구역 수"
+        )
+        parser.add_argument("--queries", type=int, default=1000, help="조회 횟수")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options["seed"])
+        spots = rng.integers(0, 5000, size=(options["spots"], 2)).tolist()
+        queries = rng.uniform(-100, 5100, size=(options["queries"], 2)).tolist()
+
+        started = time.perf_counter()
+        index = ParkingSpotIndex(spots)
+        build = time.perf_counter() - started
+
+        started = time.perf_counter()
+        expected = [linear_nearest(spots, query) for query in queries]
+        linear = time.perf_counter() - started
+
+        started = time.perf_counter()
+        actual = [index.nearest(query, k=1)[0][0] for query in queries]
+        indexed = time.perf_counter() - started
+
+        mismatches = sum(a != b for a, b in zip(actual, expected))
+        per_query = 1e6 / len(queries)
+        self.stdout.write(
+            f"spots={len(spots)} queries={len(queries)} "
+            f"cell_size={index.cell_size:.2f} build={build * 1e3:.1f}ms"
+        )
+        self.stdout.write(f"linear: {linear * per_query:.1f}us/query")
+        self.stdout.write(f"index:  {indexed * per_query:.1f}us/query")
+        self.stdout.write(f"speedup: {linear / indexed:.1f}x, mismatches: {mismatches}")
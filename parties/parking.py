@@ -0,0 +1,173 @@
+# 주차 구역(parking spot) 공간 인덱스
+# PARKING_SPOTS["PATH"]의 JSON 파일([[x, y], ...])을 읽어 균일 격자(grid) 인덱스를 만든다
+# 좌표는 지도 이미지 위의 평면 좌표이므로 유클리드 거리를 사용한다
+# 파일이 바뀌면(mtime) 다음 조회 시 다시 읽으므로 서버를 재시작하지 않고 주차 구역을 갱신할 수 있다
+import json
+import math
+import os
+import threading
+
+import numpy as np
+from django.conf import settings
+
+from common import geo
+
+
+class ParkingSpotIndex:
+    """
+    Uniform grid over planar points
+
+    Points are sorted by cell id (row-major) so that each grid row within a
+    column range is one contiguous slice of `order`. `offsets[cell]` is the
+    first position of that cell in `order` (CSR layout).
+    """
+
+    def __init__(self, spots, cell_size=None):
+        self.spots = list(spots)
+        self.points = np.asarray(self.spots, dtype=np.float64).reshape(-1, 2)
+        if not len(self.points):
+            raise ValueError("Parking spot index requires at least one spot")
+
+        self.origin = self.points.min(axis=0)
+        extent = self.points.max(axis=0) - self.origin
+        if not cell_size:
+            # 셀당 평균 2개 정도의 점이 들어가도록 셀 크기를 정한다
+            area = max(extent[0], 1.0) * max(extent[1], 1.0)
+            cell_size = math.sqrt(2 * area / len(self.points))
+        self.cell_size = float(cell_size)
+        self.shape = (np.floor(extent / self.cell_size).astype(np.int64) + 1).tolist()
+
+        cells = self._cells(self.points)
+        cell_ids = cells[:, 0] * self.shape[1] + cells[:, 1]
+        self.order = np.argsort(cell_ids, kind="stable")
+        self.offsets = np.searchsorted(
+            cell_ids[self.order], np.arange(self.shape[0] * self.shape[1] + 1)
+        )
+
+    def __len__(self):
+        return len(self.spots)
+
+    def _cells(self, points):
+        cells = np.floor((points - self.origin) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, np.array(self.shape) - 1)
+
+    def _candidates(self, low, high):
+        # low, high: 포함 범위의 셀 좌표 (row, col), 격자 범위로 잘라서 사용
+        row_start, col_start = max(low[0], 0), max(low[1], 0)
+        row_end = min(high[0], self.shape[0] - 1)
+        col_end = min(high[1], self.shape[1] - 1)
+        if row_start > row_end or col_start > col_end:
+            return np.empty(0, dtype=np.int64)
+
+        width = self.shape[1]
+        slices = [
+            self.order[
+                self.offsets[row * width + col_start] : self.offsets[
+                    row * width + col_end + 1
+                ]
+            ]
+            for row in range(row_start, row_end + 1)
+        ]
+        return np.concatenate(slices)
+
+    def _ranked(self, indices, point, k=None):
+        # 가까운 순으로 k개 (None이면 전부), 거리가 같으면 파일에 먼저 나온 주차 구역을 우선한다
+        distances = geo.euclidean(point[0], point[1], *self.points[indices].T)
+        ranking = geo.top_k(distances, len(indices) if k is None else k, ties=indices)
+        return indices[ranking], distances[ranking]
+
+    def nearest(self, point, k=1):
+        """
+        Returns [(spot, distance)] for the k nearest spots, closest first
+
+        The search square grows one ring of cells at a time until k candidates
+        lie within the distance the square is guaranteed to cover.
+        """
+        point = np.asarray(point, dtype=np.float64)
+        k = min(k, len(self.spots))
+        center = np.floor((point - self.origin) / self.cell_size).astype(np.int64)
+        last = np.array(self.shape) - 1
+
+        # 격자 밖의 점은 격자에 닿는 ring부터 시작한다
+        ring = int(max(0, *(-center), *(center - last)))
+        while True:
+            low, high = center - ring, center + ring
+            indices, distances = self._ranked(self._candidates(low, high), point, k)
+
+            # 검색 사각형이 보장하는 반경 (격자 끝에 닿은 방향은 제한 없음)
+            low_edge = self.origin + low * self.cell_size
+            high_edge = self.origin + (high + 1) * self.cell_size
+            covered = min(
+                [point[axis] - low_edge[axis] for axis in (0, 1) if low[axis] > 0]
+                + [
+                    high_edge[axis] - point[axis]
+                    for axis in (0, 1)
+                    if high[axis] < last[axis]
+                ]
+                + [math.inf]
+            )
+            if len(indices) >= k and distances[k - 1] < covered:
+                break
+            if covered == math.inf:
+                break
+            ring += 1
+
+        return [
+            (self.spots[index], float(distance))
+            for index, distance in zip(indices[:k].tolist(), distances[:k].tolist())
+        ]
+
+    def within_radius(self, point, radius):
+        # [(spot, distance)] 거리순
+        point = np.asarray(point, dtype=np.float64)
+        low = np.floor((point - radius - self.origin) / self.cell_size).astype(np.int64)
+        high = np.floor((point + radius - self.origin) / self.cell_size).astype(
+            np.int64
+        )
+        indices, distances = self._ranked(self._candidates(low, high), point)
+        count = int(np.searchsorted(distances, radius, side="right"))
+        return [
+            (self.spots[index], float(distance))
+            for index, distance in zip(
+                indices[:count].tolist(), distances[:count].tolist()
+            )
+        ]
+
+
+def _config():
+    return getattr(settings, "PARKING_SPOTS", {})
+
+
+def load_spots(path):
+    with open(path) as spots_file:
+        return json.load(spots_file)
+
+
+_lock = threading.Lock()
+_state = {"index": None, "mtime": None}
+
+
+def get_index():
+    # 파일 수정 시간이 바뀌었으면 인덱스를 다시 만든다
+    path = _config()["PATH"]
+    mtime = os.stat(path).st_mtime_ns
+    if _state["mtime"] != mtime:
+        with _lock:
+            if _state["mtime"] != mtime:
+                _state["index"] = ParkingSpotIndex(
+                    load_spots(path), _config().get("CELL_SIZE")
+                )
+                _state["mtime"] = mtime
+    return _state["index"]
+
+
+def reload():
+    with _lock:
+        _state["mtime"] = None
+    return get_index()
+
+
+def nearest_parking_spot(coordinates):
+    # [x, y]에서 가장 가까운 주차 구역 좌표
+    (spot, _), *_ = get_index().nearest(coordinates, k=1)
+    return spot
@@ -0,0 +1,87 @@
+# parties 관련 Supabase 조회 함수
+# SQL 함수 정의는 db/migrations 참고
+# 목록 쿼리 빌더와 직렬화 함수는 동기 views와 비동기 async_views가 함께 사용한다
+from common import projections
+from common.listing import attach_image_url
+from common.proximity import ProximityIndex
+
+
+def _open(query):
+    return query.eq("state", 0)
+
+
+# 모집 중인 파티의 위치 인덱스 (parties_list near 모드)
+open_parties_index = ProximityIndex("parties", _open)
+
+
+def open_parties_query(client):
+    # 모집 중인 파티를 모임 시간 순으로 조회하는 쿼리
+    return _open(client.table("parties").select(projections.PARTIES_LIST)).order(
+        "meet_at", desc=False
+    )
+
+
+def open_parties_by_id_query(client, party_ids):
+    # near 모드에서 인덱스가 찾은 파티 중 여전히 모집 중인 파티만 조회하는 쿼리
+    return _open(
+        client.table("parties").select(projections.PARTIES_LIST).in_("id", party_ids)
+    )
+
+
+def serialize_party_summary(party, image_urls):
+    data = {
+        "id": party["id"],
+        "created_at": party["created_at"],
+        "title": party["title"],
+        "destination": party["destination"],
+        "meet_at": party["meet_at"],
+        "num_participants": len(party["participant_ids"]),
+        "remaining_num": party["max_users"] - len(party["participant_ids"]),
+        "coordinates": party["coordinates"],
+        "parking_spot": party["parking_spot"],
+    }
+
+    # 이미지 추가
+    return attach_image_url(data, image_urls, party["id"])
+
+
+def fetch_party_detail(client, party_id):
+    # party_detail RPC로 파티, 주최자, 참가자, 이미지 URL을 한 번에 조회한다
+    # {"party": {...}, "organizer": {"nickname": ...} | None,
+    #  "participants": [{"user_id": ..., "nickname": ...}], "image_url": ... | None}
+    # 파티가 없으면 None을 반환
+    return client.rpc("party_detail", {"p_party_id": party_id}).execute().data or None
+
+
+def join_party(client, party_id, user_id):
+    # 정원, 모집 상태, 중복 참가를 검사한 뒤 참가자를 추가한다
+    # {"participant_ids": [...]}
+    return (
+        client.rpc("party_join", {"p_party_id": party_id, "p_user_id": user_id})
+        .execute()
+        .data
+    )
+
+
+def start_party_ride(client, party_id, user_id):
+    # {"omw_ids": [...]}
+    return (
+        client.rpc("party_start", {"p_party_id": party_id, "p_user_id": user_id})
+        .execute()
+        .data
+    )
+
+
+def end_party_ride(client, party_id, user_id):
+    # 운행 중인 사용자를 omw_ids에서 finished_ids로 옮기고, 변경 후 파티를 반환한다
+    return (
+        client.rpc("party_endride", {"p_party_id": party_id, "p_user_id": user_id})
+        .execute()
+        .data
+    )
+
+
+def finish_party(client, party_id):
+    # 모집 중인 파티를 종료 상태로 바꾸고 출발한 사용자에게 보상을 지급한다 (한 트랜잭션)
+    # {"finished": bool, "omw_ids": [...]}, 이미 종료된 파티면 finished는 false
+    return client.rpc("party_finish", {"p_party_id": party_id}).execute().data
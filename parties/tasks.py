@@ -0,0 +1,84 @@
+# parties 앱의 비동기 작업 (jobs.queue, python manage.py runjobs에서 처리)
+import uuid
+
+from django.conf import settings
+from supabase import Client
+
+from authorize import principal_cache
+from common import list_cache
+from common.supabase_clients import get_service_client
+from jobs.queue import handler, remove_spooled
+
+from .frames import apply_frame
+from .queries import finish_party
+
+supabase: Client = get_service_client()
+
+END_PARTY = "parties.end"
+
+
+def _image_id(party_id):
+    # 파티당 하나인 종료 사진의 id, 재시도해도 같은 행과 파일을 덮어쓴다
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"jahayeon:parties:{party_id}:end"))
+
+
+def _remove_image(payload):
+    # 작업이 끝나면(성공 또는 마지막 시도 실패) spool 파일을 삭제한다
+    remove_spooled(payload["image_path"])
+
+
+@handler(END_PARTY, cleanup=_remove_image)
+def end_party(payload):
+    """
+    파티 종료 사진에 프레임을 합성해 업로드하고, 파티를 종료 상태로 바꾸며 참가자 보상을 지급한다
+
+    재시도되어도 결과가 같도록 사진 파일과 images 행은 파티 id로 덮어쓰고,
+    종료와 보상은 party_finish RPC가 state = 0인 경우에만 한 번 처리한다.
+    """
+    party_id = payload["party_id"]
+
+    party = (
+        supabase.table("parties")
+        .select("state")
+        .eq("id", party_id)
+        .single()
+        .execute()
+        .data
+    )
+    if party["state"] == 1:
+        # 이전 시도나 다른 작업에서 이미 종료했으면 다시 처리하지 않는다
+        images = (
+            supabase.table("images")
+            .select("url")
+            .eq("party_id", party_id)
+            .limit(1)
+            .execute()
+            .data
+        )
+        return {"url": images[0]["url"] if images else None, "finished": False}
+
+    with open(payload["image_path"], "rb") as image:
+        image_bytes, file_extension, content_type = apply_frame(image)
+
+    image_id = _image_id(party_id)
+    file_path = f"{image_id}.{file_extension}"
+    upload_response = supabase.storage.from_("images").upload(
+        file_path,
+        image_bytes,
+        file_options={"content-type": content_type, "upsert": "true"},
+    )
+    if not upload_response.path:
+        raise RuntimeError("Failed to upload image")
+
+    # 이미지 테이블에 정보 저장
+    public_url = f"{settings.SUPABASE_URL}/storage/v1/object/public/images/{file_path}"
+    supabase.table("images").upsert(
+        {"id": image_id, "party_id": party_id, "url": public_url}
+    ).execute()
+
+    # 파티 상태 변경과 보상 지급 (한 트랜잭션)
+    finished = finish_party(supabase, party_id)
+    principal_cache.invalidate(*finished["omw_ids"])
+    list_cache.invalidate(list_cache.PARTIES)
+
+    return {"url": public_url, "finished": finished["finished"]}
@@ -1,9 +1,13 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import async_views, views
+
+# ASGI 모드에서는 I/O 대기 시간이 긴 view를 비동기 버전으로 처리한다
+hot_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
-    path("", views.parties_list, name="parties"),
+    path("", hot_views.parties_list, name="parties"),
     path("create/", views.parties_create, name="parties_create"),
     path("<int:party_id>/", views.parties_detail, name="parties_detail"),
     path("<int:party_id>/join/", views.parties_join, name="parties_join"),
@@ -1,20 +1,38 @@
 import uuid
 
-import cv2
-import numpy as np
 from django.conf import settings
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
+from postgrest.exceptions import APIError
 from rest_framework import status
 from rest_framework.decorators import api_view, parser_classes, permission_classes
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from supabase import Client, create_client
-
-supabase: Client = create_client(
-    settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY
+from supabase import Client
+
+from common import list_cache, projections
+from common.listing import attach_image_url, fetch_image_urls
+from common.pagination import get_page_size
+from common.proximity import candidate_limit, order_by_distance, parse_near
+from common.rpc import error_status
+from common.supabase_clients import get_service_client
+from jobs.queue import enqueue_once, remove_spooled, spool_file
+
+from .parking import nearest_parking_spot
+from .queries import (
+    end_party_ride,
+    fetch_party_detail,
+    join_party,
+    open_parties_by_id_query,
+    open_parties_index,
+    open_parties_query,
+    serialize_party_summary,
+    start_party_ride,
 )
+from .tasks import END_PARTY
+
+supabase: Client = get_service_client()
 
 PARTY_STATE_MAP = {
     0: "RECRUITING",  # 모집 중
@@ -74,52 +92,31 @@ def parties_detail(request, party_id):
         user_id = request.user.user_id
         # user_id = "12b2ac5e-98f6-44be-b790-1305293b52bd"
 
-        # 파티 정보 조회
-        party_response = (
-            supabase.table("parties").select("*").eq("id", party_id).execute()
-        )
-        if not party_response.data:
+        # 파티, 주최자, 참가자, 이미지를 한 번에 조회
+        detail = fetch_party_detail(supabase, party_id)
+        if not detail:
             return Response(
                 {"error": "Party not found"}, status=status.HTTP_404_NOT_FOUND
             )
-        party = party_response.data[0]
+        party = detail["party"]
 
-        # 주최자 닉네임 조회
-        organizer_response = (
-            supabase.table("users")
-            .select("nickname")
-            .eq("user_id", party["organizer_id"])
-            .execute()
-        )
-        if not organizer_response.data:
+        if not detail["organizer"]:
             return Response(
                 {"error": "Organizer not found"}, status=status.HTTP_404_NOT_FOUND
             )
-        organizer_nickname = organizer_response.data[0]["nickname"]
+        organizer_nickname = detail["organizer"]["nickname"]
 
-        # 참가자들의 상태 정보 구성
+        # 참가자별 상태 정보 구성
         participants_status = []
-        if party["participant_ids"]:
-            # 모든 참가자의 닉네임 한 번에 조회
-            participants_data = (
-                supabase.table("users")
-                .select("user_id, nickname")
-                .in_("user_id", party["participant_ids"])
-                .execute()
-                .data
+        for participant in detail["participants"]:
+            participants_status.append(
+                {
+                    "id": participant["user_id"],
+                    "nickname": participant["nickname"],
+                    "status": participant["user_id"] in (party.get("omw_ids") or []),
+                }
             )
 
-            # 참가자별 상태 정보 구성
-            for participant in participants_data:
-                participants_status.append(
-                    {
-                        "id": participant["user_id"],
-                        "nickname": participant["nickname"],
-                        "status": participant["user_id"]
-                        in (party.get("omw_ids") or []),
-                    }
-                )
-
         if user_id in party["finished_ids"]:
             party["available_action"] = "PHOTO"
         elif party["state"] == 1:
@@ -135,11 +132,7 @@ def parties_detail(request, party_id):
         else:
             party["available_action"] = "START_RIDE"
 
-        # 이미지 url
-        image_response = (
-            supabase.table("images").select("*").eq("party_id", party["id"]).execute()
-        )
-        image_url = image_response.data[0]["url"] if image_response.data else None
+        image_url = detail["image_url"]
 
         # 분기1: is_organizer면 1) participants_status의 본인 id에 해당하는 status가 true면 "운행 종료" 2) false면 "출발하기"
         # 분기2: is_organized면 1) participants_status에 본인 id가 없으면 "참가하기"
@@ -170,7 +163,31 @@ def parties_detail(request, party_id):
 
 @swagger_auto_schema(
     method="get",
-    operation_description="모집 중인 파티 목록을 조회합니다",
+    operation_description="모집 중인 파티 목록을 조회합니다. "
+    "near를 지정하면 반경 안의 파티를 가까운 순으로 조회합니다.",
+    manual_parameters=[
+        openapi.Parameter(
+            "near",
+            in_=openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="검색 중심 지도 좌표 'x,y' (optional)",
+            required=False,
+        ),
+        openapi.Parameter(
+            "radius",
+            in_=openapi.IN_QUERY,
+            type=openapi.TYPE_NUMBER,
+            description="near 모드 검색 반경 (지도 좌표 단위)",
+            required=False,
+        ),
+        openapi.Parameter(
+            "page_size",
+            in_=openapi.IN_QUERY,
+            type=openapi.TYPE_INTEGER,
+            description="near 모드 최대 결과 수",
+            required=False,
+        ),
+    ],
     responses={
         200: openapi.Response(
             description="성공",
@@ -191,6 +208,10 @@ def parties_detail(request, party_id):
                             type=openapi.TYPE_ARRAY,
                             items=openapi.Schema(type=openapi.TYPE_NUMBER),
                         ),
+                        "distance": openapi.Schema(
+                            type=openapi.TYPE_NUMBER,
+                            description="near 모드에서 검색 중심까지의 거리 (지도 좌표 단위)",
+                        ),
                     },
                 ),
             ),
@@ -202,132 +223,58 @@ def parties_detail(request, party_id):
 # @permission_classes([AllowAny])
 def parties_list(request):
     try:
-        parties = (
-            supabase.table("parties")
-            .select("*")
-            .eq("state", 0)
-            .order("meet_at", desc=False)
-            .execute()
-            .data
-        )
+        near = parse_near(request.query_params)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        if not parties:
-            return Response([], status=status.HTTP_200_OK)
+    try:
+        if near is not None:
+            return _nearby_parties(request, near)
 
-        # 해당하는 parties의 이미지 조회
-        images = (
-            supabase.table("images")
-            .select("*")
-            .in_("party_id", [party["id"] for party in parties])
-            .execute()
-        )
+        # 모든 사용자에게 같은 목록이므로 직렬화된 응답을 캐시한다 (common/list_cache.py)
+        body, headers = list_cache.fetch(list_cache.PARTIES, "", _open_parties)
+        return list_cache.response(body, headers)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        reconstructed_data = []
-        for party in parties:
-            data = {
-                "id": party["id"],
-                "created_at": party["created_at"],
-                "title": party["title"],
-                "destination": party["destination"],
-                "meet_at": party["meet_at"],
-                "num_participants": len(party["participant_ids"]),
-                "remaining_num": party["max_users"] - len(party["participant_ids"]),
-                "coordinates": party["coordinates"],
-                "parking_spot": party["parking_spot"],
-            }
 
-            # 이미지 추가
-            for image in images.data:
-                if image["party_id"] == party["id"]:
-                    data["image_url"] = image["url"]
-                    break
+def _open_parties():
+    # (모집 중인 파티 목록, 응답 헤더)
+    parties = open_parties_query(supabase).execute().data
 
-            reconstructed_data.append(data)
+    if not parties:
+        return [], None
 
-        return Response(reconstructed_data, status=status.HTTP_200_OK)
-    except Exception as e:
-        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    # 해당하는 parties의 이미지 조회
+    image_urls = fetch_image_urls(
+        supabase, "party_id", [party["id"] for party in parties]
+    )
+
+    return [serialize_party_summary(party, image_urls) for party in parties], None
+
+
+def _nearby_parties(request, near):
+    # near 모드: 반경 안의 모집 중인 파티를 가까운 순으로 page_size개까지 반환
+    page_size = get_page_size(
+        request, settings.PROXIMITY["PAGE_SIZE"], settings.PROXIMITY["PAGE_SIZE_MAX"]
+    )
+    matches = open_parties_index.search(*near, candidate_limit(page_size))
+    if not matches:
+        return Response([], status=status.HTTP_200_OK)
+
+    rows = open_parties_by_id_query(supabase, [party_id for party_id, _ in matches])
+    parties = order_by_distance(rows.execute().data, matches, page_size)
 
+    image_urls = fetch_image_urls(
+        supabase, "party_id", [party["id"] for party, _ in parties]
+    )
 
-PARKING_SPOTS = [
-    [37, 129],
-    [288, 336],
-    [177, 365],
-    [15, 421],
-    [156, 163],
-    [141, 432],
-    [274, 247],
-    [144, 321],
-    [171, 426],
-    [251, 350],
-    [268, 437],
-    [327, 245],
-    [31, 224],
-    [13, 268],
-    [334, 429],
-    [175, 209],
-    [56, 187],
-    [221, 325],
-    [184, 129],
-    [341, 338],
-    [234, 453],
-    [6, 294],
-    [286, 424],
-    [323, 409],
-    [193, 342],
-    [128, 237],
-    [158, 294],
-    [196, 393],
-    [194, 187],
-    [58, 442],
-    [339, 287],
-    [117, 423],
-    [311, 142],
-    [7, 396],
-    [216, 419],
-    [33, 279],
-    [299, 87],
-    [303, 425],
-    [280, 145],
-    [26, 451],
-]
-
-
-def apply_frame(
-    uploaded_image,
-):
-    """
-    Places overlay image on top of the background image, respecting transparency
-
-    Parameters:
-    uploaded_image: Django UploadedFile from request.FILES
-    overlay_path: Path to PNG overlay with transparency
-    """
-    overlay_path = "./public/gcoo_frame.png"
-
-    # Convert Django uploaded file to numpy array
-    image_bytes = uploaded_image.read()
-    uploaded_image.seek(0)
-    nparr = np.frombuffer(image_bytes, np.uint8)
-    background = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-
-    # Load overlay (PNG with transparency)
-    overlay = cv2.imread(overlay_path, cv2.IMREAD_UNCHANGED)
-
-    # Resize overlay to match background dimensions
-    overlay_resized = cv2.resize(overlay, (background.shape[1], background.shape[0]))
-
-    # Create mask from alpha channel
-    alpha_channel = overlay_resized[:, :, 3] / 255.0
-    alpha_3_channel = np.stack([alpha_channel, alpha_channel, alpha_channel], axis=2)
-
-    # Combine images
-    foreground = overlay_resized[:, :, :3]
-    result = background * (1 - alpha_3_channel) + foreground * alpha_3_channel
-
-    # Save result
-    _, buffer = cv2.imencode(".png", result)
-    return buffer.tobytes()
+    reconstructed_data = [
+        {**serialize_party_summary(party, image_urls), "distance": distance}
+        for party, distance in parties
+    ]
+
+    return Response(reconstructed_data, status=status.HTTP_200_OK)
 
 
 @swagger_auto_schema(
@@ -454,14 +401,12 @@ def parties_create(request):
             "meet_at": request.data.get("meet_at"),
         }
 
-        party["parking_spot"] = min(
-            PARKING_SPOTS,
-            key=lambda spot: (spot[0] - party["coordinates"][0]) ** 2
-            + (spot[1] - party["coordinates"][1]) ** 2,
-        )
+        # 가장 가까운 주차 구역 (parking.py)
+        party["parking_spot"] = nearest_parking_spot(party["coordinates"])
 
         # 파티 생성
         party = supabase.table("parties").insert(party).execute().data[0]
+        open_parties_index.add(party)
 
         # 이미지 처리
         image_file = request.FILES.get("image")
@@ -489,6 +434,8 @@ def parties_create(request):
                 {"id": image_id, "party_id": party["id"], "url": public_url}
             ).execute()
 
+        list_cache.invalidate(list_cache.PARTIES)
+
         return Response(party, status=status.HTTP_201_CREATED)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -540,45 +487,16 @@ def parties_join(request, party_id):
         user_id = request.user.user_id
         # user_id = "56f9b4f6-327d-4138-b820-2d2cf54a3425"
 
-        party = (
-            supabase.table("parties")
-            .select("*")
-            .eq("id", party_id)
-            .single()
-            .execute()
-            .data
-        )
-
-        if not party:
-            return Response(
-                {"error": "Party not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-
-        if party["state"] != 0:
-            return Response(
-                {"error": "Party is not recruiting"}, status=status.HTTP_400_BAD_REQUEST
-            )
-
-        if party["max_users"] <= len(party["participant_ids"]):
-            return Response(
-                {"error": "Party is full"}, status=status.HTTP_400_BAD_REQUEST
-            )
-
-        if user_id in party["participant_ids"] or user_id == party["organizer_id"]:
-            return Response(
-                {"error": "User already joined"}, status=status.HTTP_400_BAD_REQUEST
-            )
-
-        party["participant_ids"].append(user_id)
-
-        party = (
-            supabase.table("parties").update(party).eq("id", party_id).execute().data[0]
-        )
+        # 모집 상태, 정원, 중복 참가 검사와 참가자 추가를 DB에서 한 번에 처리
+        join_party(supabase, party_id, user_id)
+        list_cache.invalidate(list_cache.PARTIES)
 
         return Response(
             {"msg": f"User {user_id} joined party {party_id}"},
             status=status.HTTP_200_OK,
         )
+    except APIError as e:
+        return Response({"error": e.message}, status=error_status(e))
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -629,35 +547,14 @@ def parties_start(request, party_id):
         user_id = request.user.user_id
         # user_id = "56f9b4f6-327d-4138-b820-2d2cf54a3425"
 
-        party = (
-            supabase.table("parties")
-            .select("*")
-            .eq("id", party_id)
-            .single()
-            .execute()
-            .data
-        )
-
-        if not party:
-            return Response(
-                {"error": "Party not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-
-        if party["state"] == 1:
-            return Response(
-                {"error": "Party is already finished"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        party["omw_ids"].append(user_id)
-        party = (
-            supabase.table("parties").update(party).eq("id", party_id).execute().data[0]
-        )
+        start_party_ride(supabase, party_id, user_id)
 
         return Response(
             {"msg": f"User {user_id} started party {party_id}"},
             status=status.HTTP_200_OK,
         )
+    except APIError as e:
+        return Response({"error": e.message}, status=error_status(e))
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -678,13 +575,16 @@ def parties_start(request, party_id):
         ),
     ],
     responses={
-        200: openapi.Response(
-            description="종료 성공",
+        202: openapi.Response(
+            description="종료 요청 접수 (GET /api/v1/jobs/{job_id}/ 의 result.url로 업로드된 이미지 URL 확인)",
             schema=openapi.Schema(
                 type=openapi.TYPE_OBJECT,
                 properties={
-                    "url": openapi.Schema(
-                        type=openapi.TYPE_STRING, description="업로드된 이미지 URL"
+                    "job_id": openapi.Schema(
+                        type=openapi.TYPE_STRING, description="종료 작업 ID"
+                    ),
+                    "status": openapi.Schema(
+                        type=openapi.TYPE_STRING, description="작업 상태"
                     ),
                 },
             ),
@@ -734,7 +634,7 @@ def parties_end(request, party_id):
 
         party = (
             supabase.table("parties")
-            .select("*")
+            .select(projections.PARTY_END)
             .eq("id", party_id)
             .single()
             .execute()
@@ -759,45 +659,27 @@ def parties_end(request, party_id):
             )
 
         image = request.FILES.get("image")
-        file_extension = image.name.split(".")[-1].lower()
-        image_bytes = apply_frame(request.FILES.get("image"))
-        image_id = str(uuid.uuid4())
-        file_path = f"{image_id}.{file_extension}"
-        upload_response = supabase.storage.from_("images").upload(
-            file_path, image_bytes
-        )
-        if not upload_response.path:
+        if not image:
             return Response(
-                {"error": "Failed to upload image"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
-        # 이미지 테이블에 정보 저장 (URL 구성 수정)
-        public_url = (
-            f"{settings.SUPABASE_URL}/storage/v1/object/public/images/{file_path}"
-        )
-        supabase.table("images").insert(
-            {"id": image_id, "party_id": party["id"], "url": public_url}
-        ).execute()
-
-        for omw_id in party["omw_ids"]:
-            user = (
-                supabase.table("users")
-                .select("*")
-                .eq("user_id", omw_id)
-                .execute()
-                .data[0]
+                {"error": "Image is required"}, status=status.HTTP_400_BAD_REQUEST
             )
-            supabase.table("users").update(
-                {"level": user["level"] + 5, "num_parties": user["num_parties"] + 1}
-            ).eq("user_id", omw_id).execute()
 
-        # 파티 상태 변경
-        party["state"] = 1
-        party = (
-            supabase.table("parties").update(party).eq("id", party_id).execute().data[0]
+        # 사진 합성, 업로드, 보상 지급은 runjobs worker에서 처리
+        # 같은 파티에 대해 대기 중이거나 실행 중인 종료 작업이 있으면 그 작업을 반환
+        image_path = spool_file(image)
+        job, created = enqueue_once(
+            END_PARTY,
+            {"party_id": party_id, "image_path": image_path},
+            dedupe_key=f"{END_PARTY}:{party_id}",
+            user_id=user_id,
         )
+        if not created:
+            remove_spooled(image_path)
 
-        return Response({"url": public_url}, status=status.HTTP_200_OK)
+        return Response(
+            {"job_id": str(job.id), "status": job.status},
+            status=status.HTTP_202_ACCEPTED,
+        )
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -808,24 +690,12 @@ def parties_endride(request, party_id):
     try:
         user_id = request.user.user_id
 
-        party = (
-            supabase.table("parties")
-            .select("*")
-            .eq("id", party_id)
-            .single()
-            .execute()
-            .data
-        )
-
-        if user_id in party["omw_ids"]:
-            party["omw_ids"].remove(user_id)
-            party["finished_ids"].append(user_id)
-        party = (
-            supabase.table("parties").update(party).eq("id", party_id).execute().data[0]
-        )
+        party = end_party_ride(supabase, party_id, user_id)
         process_party_response(party)
 
         return Response(party, status=status.HTTP_200_OK)
+    except APIError as e:
+        return Response({"error": e.message}, status=error_status(e))
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -871,7 +741,7 @@ def parties_my(request):
 
         parties = (
             supabase.table("parties")
-            .select("*")
+            .select(projections.PARTIES_MY)
             .or_(f"organizer_id.eq.{user_id},participant_ids.cs.{{{user_id}}}")
             .order("created_at", desc=True)
             .execute()
@@ -882,12 +752,8 @@ def parties_my(request):
             return Response([], status=status.HTTP_200_OK)
 
         # 이미지 데이터 조회
-        images = (
-            supabase.table("images")
-            .select("*")
-            .in_("party_id", [party["id"] for party in parties])
-            .execute()
-            .data
+        image_urls = fetch_image_urls(
+            supabase, "party_id", [party["id"] for party in parties]
         )
 
         # reconstruct response
@@ -907,10 +773,7 @@ def parties_my(request):
             }
 
             # 이미지 URL 추가
-            for image in images:
-                if image["party_id"] == party["id"]:
-                    data["image_url"] = image["url"]
-                    break
+            attach_image_url(data, image_urls, party["id"])
 
             reconstructed_data.append(data)
 
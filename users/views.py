@@ -1,4 +1,3 @@
-from django.conf import settings
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
@@ -6,10 +5,15 @@ from rest_framework.decorators import api_view  # , permission_classes
 
 # from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from supabase import Client, create_client
+from supabase import Client
 
-# Supabase 클라이언트 설정
-supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+from authorize import principal_cache
+from common import projections
+from common.concurrency import gather
+from common.supabase_clients import get_client
+
+# Supabase 클라이언트 (프로세스 단위로 공유)
+supabase: Client = get_client()
 
 
 @swagger_auto_schema(
@@ -110,7 +114,10 @@ def user_profile(request):
             user_id = request.user.user_id
             # user_id = "12b2ac5e-98f6-44be-b790-1305293b52bd"
             user_data = (
-                supabase.table("users").select("*").eq("user_id", user_id).execute()
+                supabase.table("users")
+                .select(projections.USER_PROFILE)
+                .eq("user_id", user_id)
+                .execute()
             )
             if not user_data.data:
                 raise Exception("사용자 정보를 찾을 수 없습니다.")
@@ -152,7 +159,10 @@ def user_profile(request):
             nickname = request.data.get("nickname")
 
             user_exists = (
-                supabase.table("users").select("*").eq("user_id", user_id).execute()
+                supabase.table("users")
+                .select(projections.USER_EXISTS)
+                .eq("user_id", user_id)
+                .execute()
             )
             if not user_exists.data:
                 return Response(
@@ -170,6 +180,7 @@ def user_profile(request):
 
             if not result.data:
                 raise Exception("닉네임 업데이트에 실패했습니다.")
+            principal_cache.invalidate(user_id)
 
             return Response(
                 {"message": "닉네임이 수정되었습니다."}, status=status.HTTP_200_OK
@@ -230,9 +241,9 @@ def user_history(request):
         # user_id = "12b2ac5e-98f6-44be-b790-1305293b52bd"
 
         # parties에 참여한 경우
-        parties = (
+        parties_query = (
             supabase.table("parties")
-            .select("*")
+            .select(projections.USER_HISTORY_PARTIES)
             .or_(
                 "organizer_id.eq."
                 + user_id
@@ -242,18 +253,19 @@ def user_history(request):
                 + "}",
             )
             .order("created_at", desc=True)
-            .execute()
         )
 
         # events를 참여 완료한 경우
-        events = (
+        events_query = (
             supabase.table("events")
-            .select("id, created_at")
+            .select(projections.USER_HISTORY_EVENTS)
             .contains("completed_user_ids", "{" + user_id + "}")
             .order("created_at", desc=True)
-            .execute()
         )
 
+        # 두 조회는 서로 독립적이므로 동시에 실행
+        parties, events = gather(parties_query.execute, events_query.execute)
+
         parties_id = [party["id"] for party in parties.data]
         events_id = [event["id"] for event in events.data]
 